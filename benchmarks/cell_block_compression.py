@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+"""
+@author: xi
+@since: 2026-10-16
+
+Compare the bytes on wire and the client CPU cost of compressed and uncompressed cell blocks.
+
+The rows are synthetic but text-heavy, which is the case compression is meant for.
+The CPU time measured here is the client side decoding only (decompress + decode_cells).
+
+Usage:
+    python3 benchmarks/cell_block_compression.py [num_rows] [num_columns]
+"""
+
+import random
+import struct
+import sys
+import time
+
+from hbase.services import codec
+
+WORDS = (
+    'region', 'server', 'scan', 'table', 'family', 'qualifier', 'timestamp', 'value', 'video',
+    'user', 'click', 'event', 'session', 'http', 'https', 'www', 'com', 'index', 'search', 'page'
+)
+
+
+def encode_cell(row, family, qualifier, value, timestamp=1530000000000, cell_type=4):
+    key = b''.join((
+        struct.pack('>H', len(row)), row,
+        struct.pack('>B', len(family)), family,
+        qualifier,
+        struct.pack('>QB', timestamp, cell_type)
+    ))
+    return struct.pack('>III', 8 + len(key) + len(value), len(key), len(value)) + key + value
+
+
+def make_cell_block(num_rows, num_columns):
+    rnd = random.Random(0)
+    chunks = list()
+    for i in range(num_rows):
+        row = ('%016d' % (i * 7919)).encode()
+        for j in range(num_columns):
+            value = ' '.join(rnd.choice(WORDS) for _ in range(rnd.randint(5, 40))).encode()
+            chunks.append(encode_cell(row, b'cf', ('col%02d' % j).encode(), value))
+    return b''.join(chunks)
+
+
+def measure(fn, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    num_columns = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    block = make_cell_block(num_rows, num_columns)
+    num_cells = num_rows * num_columns
+
+    print('%d rows, %d cells, %d bytes uncompressed' % (num_rows, num_cells, len(block)))
+    print('%-10s %12s %8s %14s %14s' % ('method', 'wire bytes', 'ratio', 'decode ms', 'us/cell'))
+
+    elapsed = measure(lambda: codec.decode_cells(block))
+    print('%-10s %12d %8.2f %14.2f %14.3f' % (
+        'none', len(block), 1.0, elapsed * 1000, elapsed * 1e6 / num_cells
+    ))
+    for name in ('deflate', 'gzip'):
+        compressor = codec.get_compressor(name)
+        compressed = codec.compress(block, compressor)
+        assert codec.decompress(compressed) == block
+        elapsed = measure(lambda: codec.decode_cells(codec.decompress(compressed)))
+        print('%-10s %12d %8.2f %14.2f %14.3f' % (
+            name, len(compressed), len(block) / len(compressed), elapsed * 1000, elapsed * 1e6 / num_cells
+        ))
+
+
+if __name__ == '__main__':
+    exit(main())
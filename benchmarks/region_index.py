@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+"""
+@author: xi
+@since: 2026-10-16
+
+Measure the region cache of RegionManager, a sorted array per table searched with bisect.
+
+The cache used to be a red-black tree (hbase/client/rbtree.py), which is not in the package any more.
+For the numbers of the tree, check out the baseline commit cbfecfc and time its RegionManager the same way.
+
+Usage:
+    python3 benchmarks/region_index.py [num_regions] [num_lookups]
+"""
+
+import random
+import sys
+import time
+
+from hbase.client import region as _region
+
+TABLE = 'ns:benchmark'
+
+
+def make_regions(num_regions):
+    rnd = random.Random(0)
+    keys = sorted(set(rnd.getrandbits(64).to_bytes(8, 'big') for _ in range(num_regions - 1)))
+    bounds = [b''] + keys
+    return [
+        _region.Region(
+            TABLE.encode() + b',' + start_key + b',1',
+            TABLE,
+            start_key,
+            end_key,
+            'localhost',
+            16020
+        )
+        for start_key, end_key in zip(bounds, keys + [b''])
+    ]
+
+
+def make_keys(num_keys):
+    rnd = random.Random(1)
+    return [rnd.getrandbits(64).to_bytes(8, 'big') for _ in range(num_keys)]
+
+
+def index_insert(regions):
+    index = _region.RegionIndex()
+    for region in regions:
+        index.add(region)
+    return index
+
+
+def index_insert_all(regions):
+    index = _region.RegionIndex()
+    index.add_all(regions)
+    return index
+
+
+def index_lookup(index, keys):
+    for key in keys:
+        index.find(key)
+
+
+def index_invalidate(index, regions):
+    for region in regions:
+        index.remove(region.start_key)
+        index.add(region)
+
+
+def measure(fn, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    num_regions = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    num_lookups = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    regions = make_regions(num_regions)
+    shuffled = list(regions)
+    random.Random(2).shuffle(shuffled)
+    keys = make_keys(num_lookups)
+    invalidated = shuffled[:len(shuffled) // 5]
+
+    index = index_insert(shuffled)
+    for key in keys[:1000]:
+        region = index.find(key)
+        assert region.start_key <= key and (region.end_key == b'' or key < region.end_key)
+
+    print('%d regions, %d lookups, %d invalidations' % (len(regions), num_lookups, len(invalidated)))
+    print('%-18s %12s %12s %16s' % ('cache', 'insert ms', 'lookup ms', 'invalidate ms'))
+    print('%-18s %12.2f %12.2f %16.2f' % (
+        'index',
+        measure(lambda: index_insert(shuffled)) * 1000,
+        measure(lambda: index_lookup(index, keys)) * 1000,
+        measure(lambda: index_invalidate(index, invalidated)) * 1000
+    ))
+    print('%-18s %12.2f %12s %16s' % (
+        'index (add_all)',
+        measure(lambda: index_insert_all(shuffled)) * 1000,
+        '-',
+        '-'
+    ))
+
+
+if __name__ == '__main__':
+    exit(main())
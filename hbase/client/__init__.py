@@ -7,5 +7,12 @@
 
 from hbase.client.client import Client
 from hbase.client.client import Row
+from hbase.client.client import LazyRow
+from hbase.client.client import row_column
 from hbase.client.client import ColumnFamilyAttributes
 from hbase.client.client import Scanner
+from hbase.client.client import LeaseRenewer
+from hbase.client.client import MUTATE_PUT
+from hbase.client.client import MUTATE_DELETE
+from hbase.client.client import AGGREGATE_METHODS
+from hbase.client.client import Aggregator
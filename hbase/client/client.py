@@ -6,6 +6,11 @@
 """
 
 import collections
+import collections.abc
+import concurrent.futures
+import math
+import struct
+import threading
 import time
 
 from . import filters
@@ -16,6 +21,83 @@ from ..exceptions import *
 
 DEFAULT_FAMILY = 'cf'
 
+#
+# MutationProto.MutationType
+MUTATE_PUT = 2
+MUTATE_DELETE = 3
+
+#
+# Max number of times an action of a Multi request is retried on region errors.
+MULTI_RETRIES = 3
+
+#
+# Max number of times a scanner is reopened on region, transport or scanner errors in one iteration.
+SCAN_RETRIES = 3
+
+#
+# Aggregate coprocessor (org.apache.hadoop.hbase.coprocessor.AggregateImplementation)
+AGGREGATE_SERVICE = 'AggregateService'
+LONG_COLUMN_INTERPRETER = 'org.apache.hadoop.hbase.client.coprocessor.LongColumnInterpreter'
+AGGREGATE_METHODS = {
+    'count': 'GetRowNum',
+    'sum': 'GetSum',
+    'min': 'GetMin',
+    'max': 'GetMax',
+    'avg': 'GetAvg',
+    'std': 'GetStd'
+}
+
+_long = struct.Struct('>q')
+
+
+def _to_bytes(value):
+    # row keys and column names can be str or bytes, and str is encoded with UTF-8
+    return value.encode() if isinstance(value, str) else bytes(value)
+
+
+def _split_column(column):
+    """Split a column name into family and qualifier.
+
+    Args:
+        column (str|bytes): Column name, e.g., 'cf:name'.
+
+    Returns:
+        tuple[bytes, bytes]: (family, qualifier).
+
+    Raises:
+        ValueError: Invalid column name.
+
+    """
+    family, sep, qualifier = _to_bytes(column).partition(b':')
+    if not sep:
+        raise ValueError(
+            'Invalid column name. {family}:{qualifier} expected, got %s.' % str(column)
+        )
+    return family, qualifier
+
+
+def row_column(column, binary_keys):
+    """Name of a column in the rows returned by a client.
+
+    Args:
+        column (str|bytes): Column name, e.g., 'cf:name'.
+        binary_keys (bool): The client returns bytes column names, see Client.binary_keys.
+
+    Returns:
+        str|bytes: The column name as a key of the rows.
+
+    """
+    if binary_keys:
+        return _to_bytes(column)
+    return column.decode() if isinstance(column, bytes) else column
+
+
+def _row_key(row):
+    # the key of a row made by any row factory, in bytes
+    if isinstance(row, LazyRow):
+        return row.raw_key
+    return _to_bytes(row.key)
+
 
 class Row(dict):
 
@@ -23,11 +105,11 @@ class Row(dict):
         """Row object.
 
         Args:
-            key (str): Row key.
-            cells (dict[str, bytes]): Cells, e.g., {'family:qualifier': b'data'}
+            key (str|bytes): Row key.
+            cells (dict[str|bytes, bytes]): Cells, e.g., {'family:qualifier': b'data'}
 
         """
-        super(Row, self).__init__(cells)
+        super(Row, self).__init__(cells if cells is not None else {})
         self.key = key
 
     def __str__(self):
@@ -37,6 +119,187 @@ class Row(dict):
         return '%s\t%s' % (self.key, super(Row, self).__repr__())
 
 
+class LazyRow(collections.abc.Mapping):
+    __slots__ = ('_row', '_key', '_cells', '_binary_keys')
+
+    def __init__(self, row, cells, binary_keys=False):
+        """Row object which decodes the row key and the column names only when they are accessed.
+
+        It is a read only mapping of column names to values, like Row. Instead of a dict, it keeps the bytes of
+        the cells in a flat list, so it is smaller and faster to make when only some of the columns are read.
+
+        Args:
+            row (bytes): Row key.
+            cells (list[bytes]): Family, qualifier and value of each cell, e.g., [b'cf', b'a', b'data', ...]
+            binary_keys (bool): Return the row key and the column names in bytes instead of decoding them.
+
+        """
+        self._row = row
+        self._key = row if binary_keys else None
+        self._cells = cells
+        self._binary_keys = binary_keys
+
+    @classmethod
+    def from_cells(cls, pb_cells, binary_keys=False):
+        """Make a row from the cells of a scan response.
+
+        Args:
+            pb_cells (list[services.codec.Cell]): Cells of the row.
+            binary_keys (bool): Return the row key and the column names in bytes instead of decoding them.
+
+        Returns:
+            LazyRow: The row.
+            None: There is no cell.
+
+        """
+        if len(pb_cells) < 1:
+            return None
+        return cls(pb_cells[0].row, [
+            field
+            for pb_cell in pb_cells
+            for field in (pb_cell.family, pb_cell.qualifier, pb_cell.value)
+        ], binary_keys)
+
+    @classmethod
+    def from_binary_cells(cls, pb_cells):
+        """Row factory of the clients with binary keys, see from_cells()."""
+        return cls.from_cells(pb_cells, True)
+
+    @property
+    def key(self):
+        key = self._key
+        if key is None:
+            key = self._key = self._row.decode()
+        return key
+
+    @property
+    def raw_key(self):
+        return self._row
+
+    @property
+    def nbytes(self):
+        """Number of bytes of the row key, the column names and the values."""
+        cells = self._cells
+        return len(self._row) + sum(len(field) for field in cells) + len(cells) // 3
+
+    def __getitem__(self, column):
+        try:
+            family, qualifier = _split_column(column)
+        except (AttributeError, TypeError, ValueError):
+            raise KeyError(column)
+        cells = self._cells
+        for i in range(0, len(cells), 3):
+            if cells[i + 1] == qualifier and cells[i] == family:
+                return cells[i + 2]
+        raise KeyError(column)
+
+    def __iter__(self):
+        cells = self._cells
+        if self._binary_keys:
+            for i in range(0, len(cells), 3):
+                yield cells[i] + b':' + cells[i + 1]
+        else:
+            for i in range(0, len(cells), 3):
+                yield cells[i].decode() + ':' + cells[i + 1].decode()
+
+    def __len__(self):
+        return len(self._cells) // 3
+
+    def items(self):
+        cells = self._cells
+        if self._binary_keys:
+            return [
+                (cells[i] + b':' + cells[i + 1], cells[i + 2])
+                for i in range(0, len(cells), 3)
+            ]
+        return [
+            (cells[i].decode() + ':' + cells[i + 1].decode(), cells[i + 2])
+            for i in range(0, len(cells), 3)
+        ]
+
+    def values(self):
+        return self._cells[2::3]
+
+    def update(self, other):
+        """Append the cells of the rest of a partial row.
+
+        Args:
+            other (LazyRow): The rest of the row.
+
+        """
+        self._cells.extend(other._cells)
+
+    def to_row(self):
+        """Decode all the cells to a Row object.
+
+        Returns:
+            Row: The row object.
+
+        """
+        return Row(self.key, dict(self.items()))
+
+    def __str__(self):
+        return '%s\t%s' % (self.key, repr(dict(self.items())))
+
+    def __repr__(self):
+        return '%s\t%s' % (self.key, repr(dict(self.items())))
+
+
+class Aggregator(object):
+
+    def __init__(self, op):
+        """Combine the parts of an aggregation, e.g., the results of the regions or the values of the rows.
+
+        Args:
+            op (str): One of {'count', 'sum', 'min', 'max', 'avg', 'std'}.
+
+        """
+        self._op = op
+        self._count = 0
+        self._value = None
+        self._square_sum = 0
+
+    def add(self, value, count=1, square_sum=0):
+        """Add a part.
+
+        Args:
+            value (int|None): Min, max or sum of the part, depending on the aggregation. None for 'count'.
+            count (int): Number of values in the part.
+            square_sum (int): Sum of the squares of the values in the part, which is only used by 'std'.
+
+        """
+        op = self._op
+        self._count += count
+        if op == 'count':
+            return
+        if op == 'min':
+            self._value = value if self._value is None else min(self._value, value)
+        elif op == 'max':
+            self._value = value if self._value is None else max(self._value, value)
+        else:
+            self._value = value if self._value is None else self._value + value
+            self._square_sum += square_sum
+
+    def result(self):
+        """Get the result.
+
+        Returns:
+            int|float|None: The result. None if there is no value, except that count returns 0.
+
+        """
+        op = self._op
+        if op == 'count':
+            return self._count
+        if op in ('avg', 'std'):
+            if self._count == 0:
+                return None
+            avg = self._value / self._count
+            if op == 'avg':
+                return avg
+            return math.sqrt(max(self._square_sum / self._count - avg * avg, 0.0))
+        return self._value
+
+
 class ColumnFamilyAttributes(dict):
 
     def __init__(self,
@@ -127,23 +390,54 @@ class ColumnFamilyAttributes(dict):
 
 class Client(object):
 
-    def __init__(self, zkquorum, zk_master_path=None, zk_region_path=None):
+    def __init__(self,
+                 zkquorum,
+                 zk_master_path=None,
+                 zk_region_path=None,
+                 cell_block=False,
+                 compression=None,
+                 binary_keys=False):
         """HBase client.
 
         Args:
             zkquorum (str): Zookeeper quorum. Comma-separated list of hosts to connect to.
                 e.g., '127.0.0.1:2181,127.0.0.1:2182,[::1]:2183'
+            zk_master_path (str): Zookeeper path of the master.
+            zk_region_path (str): Zookeeper path of the meta region server.
+            cell_block (bool): Negotiate KeyValueCodec with the region servers so that the cells of
+                Get/Scan/Multi responses are returned in a compact cell block instead of protobuf messages.
+                It is off by default, so that the requests are the same as the ones without cell block support.
+            compression (str|None): Ask the region servers to compress the cell blocks. It requires cell_block.
+                It can be one of {'deflate', 'zlib', 'gzip'}. None means no compression.
+                Compression trades CPU for bandwidth, and usually pays off for network-bound scans.
+            binary_keys (bool): Return the rows with bytes row keys and bytes column names, e.g., b'cf:name'.
+                Row keys and column names are always accepted as either str or bytes, and they are sent and
+                compared as bytes. Without binary keys, the returned ones are decoded with UTF-8.
 
         Raises:
+            ValueError: Unsupported compression, or compression without cell block.
             TransportError: Failed to connect.
             NoSuchZookeeperNodeError: The required node not found.
             ZookeeperProtocolError: Invalid response.
 
         """
         self._zkquorum = zkquorum
+        self._cell_block = cell_block
+        self._binary_keys = binary_keys
+        self._row_factory = self._cells_to_binary_row if binary_keys else self._cells_to_row
+        self._prefetched_tables = set()
+
+        compressor = services.codec.get_compressor(compression)
+        if compressor is not None and not cell_block:
+            raise ValueError('Compression requires cell block to be enabled.')
 
         self._master_service = services.MasterService(zkquorum, zk_master_path)
-        self._region_manager = _region.RegionManager(zkquorum, zk_region_path)
+        self._region_manager = _region.RegionManager(
+            zkquorum,
+            zk_region_path,
+            services.codec.KEY_VALUE_CODEC if cell_block else None,
+            compressor
+        )
 
     def __enter__(self):
         return self
@@ -154,6 +448,10 @@ class Client(object):
     def __del__(self):
         self.close()
 
+    @property
+    def binary_keys(self):
+        return self._binary_keys
+
     def close(self):
         if hasattr(self, '_master_service') and self._master_service:
             self._master_service.close()
@@ -723,6 +1021,104 @@ class Client(object):
             else:
                 break
 
+    def locate(self, table, key, use_cache=True):
+        """Find the region which a row key belongs to.
+
+        Args:
+            table (str): Table name.
+            key (str|bytes): Row key.
+            use_cache (bool): Search the region cache first.
+
+        Returns:
+            _region.Region: The region.
+
+        Raises:
+            RequestError
+
+            TransportError
+            ZookeeperProtocolError
+            ServiceProtocolError
+            NoSuchZookeeperNodeError
+
+        """
+        return self._region_manager.get_region(table, _to_bytes(key), use_cache)
+
+    def locate_range(self, table, start_key=None, end_key=None, use_cache=True):
+        """Find the regions which a key range spans.
+
+        Args:
+            table (str): Table name.
+            start_key (str|bytes|None): Start key. None means the beginning of the table.
+            end_key (str|bytes|None): End key (exclusive). None means the end of the table.
+            use_cache (bool): Search the region cache first.
+
+        Returns:
+            list[_region.Region]: The regions in key order.
+
+        Raises:
+            RequestError
+
+            TransportError
+            ZookeeperProtocolError
+            ServiceProtocolError
+            NoSuchZookeeperNodeError
+
+        """
+        regions = list()
+        key = _to_bytes(start_key) if start_key is not None else b''
+        if end_key is not None:
+            end_key = _to_bytes(end_key)
+        while True:
+            region = self._region_manager.get_region(table, key, use_cache)
+            regions.append(region)
+            key = region.end_key
+            if key == b'' or (end_key and key >= end_key):
+                break
+        return regions
+
+    def locate_all(self, table):
+        """Find all the regions of a table with one meta scan, and load them into the region cache.
+
+        Args:
+            table (str): Table name.
+
+        Returns:
+            list[_region.Region]: The regions in key order.
+
+        Raises:
+            RequestError
+
+            TransportError
+            ZookeeperProtocolError
+            ServiceProtocolError
+            NoSuchZookeeperNodeError
+
+        """
+        regions = self._region_manager.prefetch(table)
+        self._prefetched_tables.add(table)
+        return regions
+
+    def prefetch_regions(self, table):
+        """Load all the regions of a table into the region cache, unless they have been loaded before.
+
+        The batch and parallel operations usually touch most of the regions,
+        so they locate them all at once instead of one meta lookup for each region.
+
+        Args:
+            table (str): Table name.
+
+        Raises:
+            RequestError
+
+            TransportError
+            ZookeeperProtocolError
+            ServiceProtocolError
+            NoSuchZookeeperNodeError
+
+        """
+        if table not in self._prefetched_tables:
+            self.locate_all(table)
+
     def get(self,
             table,
             key,
@@ -732,7 +1128,7 @@ class Client(object):
 
         Args:
             table (str): Table name.
-            key (str): Row key.
+            key (str|bytes): Row key.
             columns (tuple[str]|list[str]): Columns to fetch.
             filter_ (filters.Filter): Filter object.
 
@@ -750,6 +1146,7 @@ class Client(object):
             NoSuchZookeeperNodeError
 
         """
+        key = _to_bytes(key)
         region = self._region_manager.get_region(table, key)
         region_service = self._region_manager.get_service(region)
 
@@ -787,37 +1184,16 @@ class Client(object):
         pb_req = protobuf.GetRequest()
 
         pb_req.region.type = 1
-        pb_req.region.value = region.name.encode()
-
-        pb_get = pb_req.get
-        pb_get.row = key.encode()
-
-        if columns is not None:
-            qualifier_dict = collections.defaultdict(list)
-            for column in columns:
-                try:
-                    family, qualifier = column.split(':')
-                except ValueError or AttributeError:
-                    raise RequestError(
-                        'Invalid column name. {family}:{qualifier} expected, got %s.' % column
-                    )
-                qualifier_dict[family.encode()].append(qualifier.encode())
-            for family, qualifiers in qualifier_dict.items():
-                pb_column = pb_get.column.add()
-                pb_column.family = family
-                pb_column.qualifier.extend(qualifiers)
+        pb_req.region.value = region.name
 
-        if filter_ is not None:
-            pb_filter = pb_get.filter
-            pb_filter.name = filter_.name
-            pb_filter.serialized_filter = filter_.serialize()
+        self._fill_get(pb_req.get, key, columns, filter_)
 
         #
         # message GetResponse {
         #   optional Result result = 1;
         # }
         try:
-            pb_resp = region_service.request(pb_req)
+            pb_resp, cells = region_service.request(pb_req, with_cells=True)
         except RegionError:
             while True:
                 time.sleep(3)
@@ -826,15 +1202,106 @@ class Client(object):
                 # refresh the region information and retry the operation
                 region = self._region_manager.get_region(table, key, use_cache=False)
                 region_service = self._region_manager.get_service(region)
-                pb_req.region.value = region.name.encode()
+                pb_req.region.value = region.name
                 # if the new region still doesn't work, it is a fatal error
                 # print(repr(region))
                 try:
-                    pb_resp = region_service.request(pb_req)
+                    pb_resp, cells = region_service.request(pb_req, with_cells=True)
                     break
                 except RegionError:
                     continue
-        return self._cells_to_row(pb_resp.result.cell)
+        # the cells are either in the cell block or in the result message
+        return self._row_factory(cells if cells else pb_resp.result.cell)
+
+    @staticmethod
+    def _fill_get(pb_get, key, columns, filter_):
+        """Fill a protobuf.Get object.
+
+        Args:
+            pb_get (protobuf.Get): The Get object.
+            key (bytes): Row key.
+            columns (tuple[str]|list[str]|None): Columns to fetch.
+            filter_ (filters.Filter|None): Filter object.
+
+        Raises:
+            RequestError: Invalid column name.
+
+        """
+        pb_get.row = key
+
+        if columns is not None:
+            qualifier_dict = collections.defaultdict(list)
+            for column in columns:
+                try:
+                    family, qualifier = _split_column(column)
+                except (ValueError, AttributeError, TypeError):
+                    raise RequestError(
+                        'Invalid column name. {family}:{qualifier} expected, got %s.' % str(column)
+                    )
+                qualifier_dict[family].append(qualifier)
+            for family, qualifiers in qualifier_dict.items():
+                pb_column = pb_get.column.add()
+                pb_column.family = family
+                pb_column.qualifier.extend(qualifiers)
+
+        if filter_ is not None:
+            pb_filter = pb_get.filter
+            pb_filter.name = filter_.name
+            pb_filter.serialized_filter = filter_.serialize()
+
+    def get_many(self,
+                 table,
+                 keys,
+                 columns=None,
+                 filter_=None,
+                 batch_size=500,
+                 max_in_flight=4):
+        """Get rows with Multi requests.
+
+        The keys are grouped by region and region server, and the Multi requests are sent to all the
+        involved region servers concurrently. Keys failed with region errors are retried with refreshed
+        region information.
+
+        Args:
+            table (str): Table name.
+            keys (list[str|bytes]|tuple[str|bytes]): Row keys.
+            columns (tuple[str]|list[str]): Columns to fetch.
+            filter_ (filters.Filter): Filter object.
+            batch_size (int): Max number of keys in each Multi request.
+            max_in_flight (int): Max number of Multi requests in flight to each region server.
+
+        Returns:
+            list[Row|None]: The rows in the same order as the keys. None if the row does not exist.
+
+        Raises:
+            RegionError
+            RequestError
+
+            TransportError
+            ZookeeperProtocolError
+            ServiceProtocolError
+            NoSuchZookeeperNodeError
+
+        """
+        keys = [_to_bytes(key) for key in keys]
+
+        def fill_action(i, pb_action, _):
+            self._fill_get(pb_action.get, keys[i], columns, filter_)
+
+        results = self._multi(
+            table,
+            keys,
+            fill_action,
+            batch_size,
+            max_in_flight,
+            with_cells=True
+        )
+        rows = list()
+        for _, cells, error in results:
+            if error is not None:
+                raise error
+            rows.append(self._row_factory(cells))
+        return rows
 
     def get_one(self,
                 table,
@@ -845,7 +1312,7 @@ class Client(object):
 
         Args:
             table (str): Table name.
-            key (str): Row key.
+            key (str|bytes): Row key.
             columns (tuple[str]|list[str]): Columns to fetch.
             filter_ (filters.Filter): Filter object.
 
@@ -865,10 +1332,12 @@ class Client(object):
         """
         if key is None:
             # TODO: Here we should use a randomly generated key.
-            key = ''
+            key = b''
+        else:
+            key = _to_bytes(key)
         region = self._region_manager.get_region(table, key)
         region_service = self._region_manager.get_service(region)
-        pb_resp = self._create_region_scanner(
+        pb_resp, cells = self._create_region_scanner(
             region,
             region_service,
             table,
@@ -877,14 +1346,14 @@ class Client(object):
             columns=columns,
             filter_=filter_,
             num_rows=1,
-            reversed=True
+            reversed=True,
+            small=True
         )
-        scanner_id = pb_resp.scanner_id
-        self._close_region_scanner(region, region_service, scanner_id)
-        if len(pb_resp.results) < 1:
+        rows = self._results_to_rows(pb_resp, cells, self._row_factory)
+        if len(rows) < 1:
             return None
         else:
-            return self._cells_to_row(pb_resp.results[0].cell)
+            return rows[0]
 
     def put(self, table, row):
         """Insert a row into a table.
@@ -903,7 +1372,7 @@ class Client(object):
             NoSuchZookeeperNodeError
 
         """
-        key = row.key
+        key = _to_bytes(row.key)
         region = self._region_manager.get_region(table, key)
         region_service = self._region_manager.get_service(region)
         # print('DEBUG: Get region\n%s' % repr(region))
@@ -981,12 +1450,12 @@ class Client(object):
         pb_req = protobuf.MutateRequest()
 
         pb_req.region.type = 1
-        pb_req.region.value = region.name.encode()
+        pb_req.region.value = region.name
 
         pb_mutation = pb_req.mutation
-        pb_mutation.row = key.encode()
+        pb_mutation.row = key
         pb_mutation.mutate_type = 2
-        pb_mutation.column_value.extend(self._row_to_column_values(row))
+        cell_block = self._set_mutation_cells(pb_mutation, row)
 
         #
         # message MutateResponse {
@@ -996,7 +1465,7 @@ class Client(object):
         #   optional bool processed = 2;
         # }
         try:
-            pb_resp = region_service.request(pb_req)
+            pb_resp = region_service.request(pb_req, cell_block=cell_block)
         except RegionError:
             while True:
                 time.sleep(3)
@@ -1005,11 +1474,11 @@ class Client(object):
                 # refresh the region information and retry the operation
                 region = self._region_manager.get_region(table, key, use_cache=False)
                 region_service = self._region_manager.get_service(region)
-                pb_req.region.value = region.name.encode()
+                pb_req.region.value = region.name
                 # if the new region still doesn't work, it is a fatal error
                 # print(repr(region))
                 try:
-                    pb_resp = region_service.request(pb_req)
+                    pb_resp = region_service.request(pb_req, cell_block=cell_block)
                     break
                 except RegionError:
                     continue
@@ -1050,26 +1519,26 @@ class Client(object):
             NoSuchZookeeperNodeError
 
         """
-        key = row.key
+        key = _to_bytes(row.key)
         region = self._region_manager.get_region(table, key)
         region_service = self._region_manager.get_service(region)
 
         pb_req = protobuf.MutateRequest()
 
         pb_req.region.type = 1
-        pb_req.region.value = region.name.encode()
+        pb_req.region.value = region.name
 
         pb_mutation = pb_req.mutation
-        pb_mutation.row = key.encode()
+        pb_mutation.row = key
         pb_mutation.mutate_type = 2
-        pb_mutation.column_value.extend(self._row_to_column_values(row))
+        cell_block = self._set_mutation_cells(pb_mutation, row)
 
         if check_column is not None:
             pb_condition = pb_req.condition
-            pb_condition.row = key.encode()
-            family, qualifier = self._split_name(check_column)
-            pb_condition.family = family.encode()
-            pb_condition.qualifier = qualifier.encode()
+            pb_condition.row = key
+            family, qualifier = _split_column(check_column)
+            pb_condition.family = family
+            pb_condition.qualifier = qualifier
             pb_condition.compare_type = comparator_type
             if check_value is None:
                 check_value = b''
@@ -1079,7 +1548,7 @@ class Client(object):
             pb_comp.serialized_comparator = comp.serialize()
 
         try:
-            pb_resp = region_service.request(pb_req)
+            pb_resp = region_service.request(pb_req, cell_block=cell_block)
         except RegionError:
             while True:
                 time.sleep(3)
@@ -1088,16 +1557,61 @@ class Client(object):
                 # refresh the region information and retry the operation
                 region = self._region_manager.get_region(table, key, use_cache=False)
                 region_service = self._region_manager.get_service(region)
-                pb_req.region.value = region.name.encode()
+                pb_req.region.value = region.name
                 # if the new region still doesn't work, it is a fatal error
                 # print(repr(region))
                 try:
-                    pb_resp = region_service.request(pb_req)
+                    pb_resp = region_service.request(pb_req, cell_block=cell_block)
                     break
                 except RegionError:
                     continue
         return pb_resp.processed
 
+    def _set_mutation_cells(self, pb_mutation, row, cell_block=None):
+        """Attach the cells of a row to a mutation.
+
+        If cell block is enabled, the cells are encoded into a cell block which is sent alongside
+        the request, and the mutation only carries the number of the associated cells.
+        Otherwise, the cells are put into the mutation as protobuf.MutationProto.ColumnValue objects.
+
+        Args:
+            pb_mutation (protobuf.MutationProto): The mutation.
+            row (Row): The row object.
+            cell_block (bytearray|None): The cell block to append to.
+                None means a new cell block is created.
+
+        Returns:
+            bytearray: The cell block.
+            None: Cell block is not used.
+
+        """
+        if not self._cell_block:
+            pb_mutation.column_value.extend(self._row_to_column_values(row))
+            return None
+        if cell_block is None:
+            cell_block = bytearray()
+        pb_mutation.associated_cell_count = self._row_to_cell_block(row, pb_mutation.row, cell_block)
+        return cell_block
+
+    @staticmethod
+    def _row_to_cell_block(row, key, cell_block):
+        """Encode the cells of a row into a cell block.
+
+        Args:
+            row (Row): The row object.
+            key (bytes): Row key.
+            cell_block (bytearray): The cell block to append to.
+
+        Returns:
+            int: Number of cells encoded.
+
+        """
+        encode_cell = services.codec.encode_cell
+        for column, value in row.items():
+            family, qualifier = _split_column(column)
+            encode_cell(cell_block, key, family, qualifier, value)
+        return len(row)
+
     @staticmethod
     def _row_to_column_values(row):
         """Convert a row to protobuf.MutationProto.ColumnValue objects.
@@ -1111,52 +1625,561 @@ class Client(object):
         """
         qv_dict = collections.defaultdict(list)
         for column, value in row.items():
-            family, qualifier = Client._split_name(column)
+            family, qualifier = _split_column(column)
             pb_qualifier_value = protobuf.MutationProto.ColumnValue.QualifierValue()
             qv_dict[family].append(pb_qualifier_value)
-            pb_qualifier_value.qualifier = qualifier.encode()
+            pb_qualifier_value.qualifier = qualifier
             pb_qualifier_value.value = value
         cv_list = list()
         for family, qv_list in qv_dict.items():
             pb_column_value = protobuf.MutationProto.ColumnValue()
             cv_list.append(pb_column_value)
-            pb_column_value.family = family.encode()
+            pb_column_value.family = family
             pb_column_value.qualifier_value.extend(qv_list)
         return cv_list
 
-    def create_scanner(self,
-                       table,
-                       start_key=None,
-                       end_key=None,
-                       columns=None,
+    def put_many(self,
+                 table,
+                 rows,
+                 batch_size=500,
+                 max_in_flight=4):
+        """Insert rows into a table with Multi requests.
+
+        The rows are grouped by region and region server. Each region server receives Multi requests
+        of at most batch_size rows, and at most max_in_flight of them are sent to the same server
+        at the same time. Rows failed with region errors are retried with refreshed region information.
+
+        Args:
+            table (str): Table name.
+            rows (list[Row]|tuple[Row]): Rows to insert.
+            batch_size (int): Max number of rows in each Multi request.
+            max_in_flight (int): Max number of Multi requests in flight to each region server.
+
+        Returns:
+            list[bool|Exception]: True for each row inserted, or the error for each row failed.
+                The order is the same as the input rows.
+
+        Raises:
+            TransportError
+            ZookeeperProtocolError
+            ServiceProtocolError
+            NoSuchZookeeperNodeError
+
+        """
+        return self.mutate_many(
+            table,
+            [(MUTATE_PUT, row) for row in rows],
+            batch_size,
+            max_in_flight
+        )
+
+    def mutate_many(self,
+                    table,
+                    mutations,
+                    batch_size=500,
+                    max_in_flight=4):
+        """Perform puts and deletes with Multi requests.
+
+        Args:
+            table (str): Table name.
+            mutations (list[tuple]): List of (mutate_type, row), where mutate_type is MUTATE_PUT or MUTATE_DELETE.
+                For MUTATE_DELETE, the whole row with key row.key is deleted.
+            batch_size (int): Max number of mutations in each Multi request.
+            max_in_flight (int): Max number of Multi requests in flight to each region server.
+
+        Returns:
+            list[bool|Exception]: True for each mutation succeeded, or the error for each mutation failed.
+                The order is the same as the input mutations.
+
+        Raises:
+            TransportError
+            ZookeeperProtocolError
+            ServiceProtocolError
+            NoSuchZookeeperNodeError
+
+        """
+        mutations = list(mutations)
+        keys = [_to_bytes(row.key) for _, row in mutations]
+
+        def fill_action(i, pb_action, cell_block):
+            mutate_type, row = mutations[i]
+            pb_mutation = pb_action.mutation
+            pb_mutation.row = keys[i]
+            pb_mutation.mutate_type = mutate_type
+            if mutate_type == MUTATE_PUT:
+                self._set_mutation_cells(pb_mutation, row, cell_block)
+
+        results = self._multi(
+            table,
+            keys,
+            fill_action,
+            batch_size,
+            max_in_flight
+        )
+        return [
+            True if error is None else error
+            for _, _, error in results
+        ]
+
+    def _multi(self,
+               table,
+               keys,
+               fill_action,
+               batch_size,
+               max_in_flight,
+               with_cells=False):
+        """Perform one action for each row key with Multi requests.
+
+        Args:
+            table (str): Table name.
+            keys (list[bytes]): Row keys.
+            fill_action ((int, protobuf.Action, bytearray|None) -> None): Function to fill the action of
+                the i-th key. The cell block of the request is given if cell block is enabled.
+            batch_size (int): Max number of actions in each Multi request.
+            max_in_flight (int): Max number of Multi requests in flight to each region server.
+            with_cells (bool): Collect the cells of the results.
+
+        Returns:
+            list[tuple]: (pb_result, cells, error) for each key. error is None if the action succeeded.
+
+        Raises:
+            TransportError
+            ZookeeperProtocolError
+            ServiceProtocolError
+            NoSuchZookeeperNodeError
+
+        """
+        self.prefetch_regions(table)
+        results = [None] * len(keys)
+        pending = list(range(len(keys)))
+        for retry in range(MULTI_RETRIES + 1):
+            if retry > 0:
+                time.sleep(3)
+            calls = self._make_multi_calls(
+                table,
+                keys,
+                pending,
+                fill_action,
+                batch_size,
+                retry > 0
+            )
+            failed = list()
+            for context, resp, error in self._fan_out(calls, max_in_flight, with_cells):
+                if error is not None:
+                    retryable = isinstance(error, (RegionError, TransportError))
+                    for _, indices in context:
+                        for i in indices:
+                            results[i] = (None, None, error)
+                            if retryable:
+                                failed.append(i)
+                    continue
+                pb_resp, cells = resp if with_cells else (resp, None)
+                cell_offset = 0
+                for (_, indices), pb_region_result in zip(context, pb_resp.regionActionResult):
+                    if pb_region_result.HasField('exception'):
+                        error = services.make_error(pb_region_result.exception.name)
+                        for i in indices:
+                            results[i] = (None, None, error)
+                            if isinstance(error, RegionError):
+                                failed.append(i)
+                        continue
+                    for pb_roe in pb_region_result.resultOrException:
+                        i = pb_roe.index
+                        if pb_roe.HasField('exception'):
+                            error = services.make_error(pb_roe.exception.name)
+                            results[i] = (None, None, error)
+                            if isinstance(error, RegionError):
+                                failed.append(i)
+                            continue
+                        pb_result = pb_roe.result
+                        num_cells = pb_result.associated_cell_count
+                        if cells and num_cells > 0:
+                            result_cells = cells[cell_offset:cell_offset + num_cells]
+                            cell_offset += num_cells
+                        else:
+                            result_cells = pb_result.cell
+                        results[i] = (pb_result, result_cells, None)
+            if not failed:
+                break
+            pending = sorted(failed)
+        return [
+            result if result is not None else (None, None, ServiceProtocolError('Missing result of the action.'))
+            for result in results
+        ]
+
+    def _make_multi_calls(self,
+                          table,
+                          keys,
+                          indices,
+                          fill_action,
+                          batch_size,
+                          refresh):
+        """Group the actions by region and region server, and build the Multi requests.
+
+        Args:
+            table (str): Table name.
+            keys (list[bytes]): Row keys.
+            indices (list[int]): Indices of the keys to perform actions on.
+            fill_action ((int, protobuf.Action, bytearray|None) -> None): Function to fill an action.
+            batch_size (int): Max number of actions in each Multi request.
+            refresh (bool): Refresh the region information instead of using the cache.
+
+        Returns:
+            dict[tuple, collections.deque]: Server address => queue of (region_service, pb_req, cell_block, context),
+                where context is a list of (region, indices) in the same order as the region actions.
+
+        """
+        #
+        # message MultiRequest {
+        #   repeated RegionAction regionAction = 1;
+        #   optional uint64 nonceGroup = 2;
+        #   optional Condition condition = 3;
+        # }
+        # message RegionAction {
+        #   required RegionSpecifier region = 1;
+        #   optional bool atomic = 2;
+        #   repeated Action action = 3;
+        # }
+        # message Action {
+        #   optional uint32 index = 1;
+        #   optional MutationProto mutation = 2;
+        #   optional Get get = 3;
+        #   optional CoprocessorServiceCall service_call = 4;
+        # }
+        server_dict = collections.OrderedDict()  # server address => region name => (region, indices)
+        refreshed = list()
+        for i in indices:
+            key = keys[i]
+            region = None
+            if refresh:
+                for region_ in refreshed:
+                    if region_.contains(key):
+                        region = region_
+                        break
+                if region is None:
+                    region = self._region_manager.get_region(table, key, use_cache=False)
+                    refreshed.append(region)
+            else:
+                region = self._region_manager.get_region(table, key)
+            region_dict = server_dict.setdefault((region.host, region.port), collections.OrderedDict())
+            try:
+                region_dict[region.name][1].append(i)
+            except KeyError:
+                region_dict[region.name] = (region, [i])
+
+        calls = dict()
+        for server, region_dict in server_dict.items():
+            queue = collections.deque()
+            calls[server] = queue
+            region_service = None
+            pb_req = cell_block = context = None
+            size = batch_size
+            for region, region_indices in region_dict.values():
+                if region_service is None:
+                    region_service = self._region_manager.get_service(region)
+                start = 0
+                while start < len(region_indices):
+                    if size >= batch_size:
+                        pb_req = protobuf.MultiRequest()
+                        cell_block = bytearray() if self._cell_block else None
+                        context = list()
+                        queue.append((region_service, pb_req, cell_block, context))
+                        size = 0
+                    chunk = region_indices[start:start + batch_size - size]
+                    start += len(chunk)
+                    size += len(chunk)
+                    pb_region_action = pb_req.regionAction.add()
+                    pb_region_action.region.type = 1
+                    pb_region_action.region.value = region.name
+                    for i in chunk:
+                        pb_action = pb_region_action.action.add()
+                        pb_action.index = i
+                        fill_action(i, pb_action, cell_block)
+                    context.append((region, chunk))
+        return calls
+
+    @staticmethod
+    def _fan_out(calls, max_in_flight, with_cells=False):
+        """Send requests to region servers concurrently and yield the responses as they complete.
+
+        Args:
+            calls (dict[tuple, collections.deque]): Server address => queue of
+                (region_service, pb_req, cell_block, context).
+            max_in_flight (int): Max number of requests in flight to the same server.
+            with_cells (bool): The responses also carry the cells in the cell blocks.
+
+        Yields:
+            tuple: (context, response, error). If the request failed, response is None.
+
+        """
+        in_flight = dict()  # future => (server, context)
+
+        def submit(server_):
+            region_service, pb_req, cell_block, context_ = calls[server_].popleft()
+            try:
+                future_ = region_service.request_async(pb_req, with_cells, cell_block if cell_block else None)
+            except (RequestError, TransportError, ProtocolError) as e:
+                future_ = concurrent.futures.Future()
+                future_.set_exception(e)
+            in_flight[future_] = (server_, context_)
+
+        for server, queue in calls.items():
+            for _ in range(min(max_in_flight, len(queue))):
+                submit(server)
+        while in_flight:
+            done, _ = concurrent.futures.wait(list(in_flight), return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                server, context = in_flight.pop(future)
+                if calls[server]:
+                    submit(server)
+                try:
+                    resp = future.result()
+                except (RequestError, TransportError, ProtocolError) as e:
+                    yield context, None, e
+                else:
+                    yield context, resp, None
+
+    def create_scanner(self,
+                       table,
+                       start_key=None,
+                       end_key=None,
+                       columns=None,
                        filter_=None,
-                       num_rows=100):
+                       num_rows=100,
+                       max_result_size=None,
+                       limit=None,
+                       small=None,
+                       reversed=False,
+                       row_factory=None):
         """Create a scanner for a table.
 
         Args:
             table (str): Table name.
-            start_key (str): Start key.
-            end_key (str): End key.
+            start_key (str|bytes): Start key.
+            end_key (str|bytes): End key.
             columns (list[str]|tuple[str]): Name of the columns to query.
                 This is similar to the projection operation in SQL.
             filter_ (filters.Filter): The filter object.
             num_rows (int): Number of rows returned in every iteration.
+            max_result_size (int|None): Max number of bytes returned in every iteration.
+                A row larger than it is returned in parts and stitched by the client.
+                None means use the region server's default.
+            limit (int|None): Max number of rows returned by the scanner. None means no limit.
+            small (bool|None): Use small scan, which opens, iterates and closes the region scanner in one
+                request. It is faster for scans of a few rows, but the rows of a region are not read in
+                one server side scan. None means to use it if all the rows can be returned in one iteration.
+            reversed (bool): Scan in descending key order. The start key is then the largest key (inclusive)
+                and the end key is the smallest key (exclusive). An empty start key means the end of the table.
+            row_factory ((list[services.codec.Cell]) -> T): Function to make a row object from the cells of a row.
+                The object should have a "key" attribute and an "update()" method to merge the rest of a partial row.
+                None means to make Row objects, see binary_keys. LazyRow.from_cells makes LazyRow objects.
 
         Returns:
             Scanner: A scanner object.
                 Note that a scanner is only an object used to store scanning information.
 
         """
+        if small is None:
+            small = limit is not None and limit <= num_rows and max_result_size is None
+        elif small and max_result_size is not None:
+            raise ValueError('max_result_size can not be used with small scan.')
         return Scanner(
             self,
             table,
-            start_key if start_key is not None else '',
-            end_key,
+            _to_bytes(start_key) if start_key is not None else b'',
+            _to_bytes(end_key) if end_key is not None else None,
             columns if columns is not None else [],
             filter_,
-            num_rows
+            num_rows,
+            max_result_size,
+            limit,
+            small,
+            reversed,
+            row_factory if row_factory is not None else self._row_factory
         )
 
+    def split_scanner(self, scanner):
+        """Split a scanner into scanners of the regions its key range spans.
+
+        Each scanner scans the part of the key range in one region, so they can be iterated independently.
+        Note that the scanners still work if the regions split or merge later.
+        The limit of the scanner is kept by each of the scanners, so the caller should apply it to the rows of
+        all the scanners.
+
+        Args:
+            scanner (Scanner): The scanner object. It should not have been iterated.
+
+        Returns:
+            list[Scanner]: Scanners in key order.
+
+        Raises:
+            RequestError
+
+            TransportError
+            ZookeeperProtocolError
+            ServiceProtocolError
+            NoSuchZookeeperNodeError
+
+        """
+        if scanner.__client__ != self:
+            raise ValueError('Invalid scanner.')
+        if scanner.__scanner_id__ is not None:
+            raise ValueError('The scanner has been iterated.')
+        self.prefetch_regions(scanner.__table__)
+        if scanner.__reversed__:
+            return self._split_reversed_scanner(scanner)
+        start_key = scanner.__start_key__
+        end_key = scanner.__end_key__
+        scanners = list()
+        for region in self.locate_range(scanner.__table__, start_key, end_key):
+            sub_start_key = max(start_key, region.start_key)
+            sub_end_key = region.end_key if region.end_key != b'' else None
+            if end_key and (sub_end_key is None or end_key < sub_end_key):
+                sub_end_key = end_key
+            scanners.append(Scanner(
+                self,
+                scanner.__table__,
+                sub_start_key,
+                sub_end_key,
+                scanner.__columns__,
+                scanner.__filter___,
+                scanner.__num_rows__,
+                scanner.__max_result_size__,
+                scanner.__limit__,
+                scanner.__small__,
+                row_factory=scanner.__row_factory__
+            ))
+        return scanners
+
+    def _split_reversed_scanner(self, scanner):
+        # the start key is the upper bound (inclusive) and the end key is the lower bound (exclusive)
+        start_key = scanner.__start_key__
+        end_key = scanner.__end_key__
+        scanners = list()
+        regions = self.locate_range(
+            scanner.__table__,
+            end_key,
+            start_key + b'\x00' if start_key != b'' else None
+        )
+        for region in reversed(regions):
+            if region.end_key != b'' and (start_key == b'' or region.end_key <= start_key):
+                # scan from the end of the region, the end key itself is excluded
+                sub_start_key = region.end_key
+                start_exclusive = True
+            else:
+                sub_start_key = start_key
+                start_exclusive = False
+            sub_end_key = region.start_key if region.start_key != b'' else None
+            end_inclusive = sub_end_key is not None
+            if end_key and (sub_end_key is None or end_key >= sub_end_key):
+                sub_end_key = end_key
+                end_inclusive = False
+            sub_scanner = Scanner(
+                self,
+                scanner.__table__,
+                sub_start_key,
+                sub_end_key,
+                scanner.__columns__,
+                scanner.__filter___,
+                scanner.__num_rows__,
+                scanner.__max_result_size__,
+                scanner.__limit__,
+                scanner.__small__,
+                True,
+                scanner.__row_factory__
+            )
+            sub_scanner.__start_exclusive__ = start_exclusive
+            sub_scanner.__end_inclusive__ = end_inclusive
+            scanners.append(sub_scanner)
+        return scanners
+
+    def create_range_scanners(self,
+                              table,
+                              ranges,
+                              columns=None,
+                              filter_=None,
+                              num_rows=100,
+                              max_result_size=None,
+                              row_factory=None):
+        """Create scanners for several key ranges of a table.
+
+        The ranges are sorted and merged, and then grouped by region. There is one scanner for each region,
+        which reads all the ranges in the region with a MultiRowRangeFilter.
+
+        Args:
+            table (str): Table name.
+            ranges (list[tuple[str, str]]|tuple[tuple[str, str]]): (start_key, end_key) pairs.
+                The start keys are inclusive and the end keys are exclusive. None means no limit.
+            columns (list[str]|tuple[str]): Name of the columns to query.
+            filter_ (filters.Filter): The filter object. It is applied together with the range filter.
+            num_rows (int): Number of rows returned in every iteration.
+            max_result_size (int|None): Max number of bytes returned in every iteration.
+            row_factory ((list[services.codec.Cell]) -> T): Function to make a row object from the cells of a row.
+                None means to make Row objects.
+
+        Returns:
+            list[Scanner]: Scanners in key order.
+
+        Raises:
+            RequestError
+
+            TransportError
+            ZookeeperProtocolError
+            ServiceProtocolError
+            NoSuchZookeeperNodeError
+
+        """
+        merged_ranges = list()
+        # sorted by start key only, since the end keys can be None
+        for start_key, end_key in sorted(
+                ((_to_bytes(start_key) if start_key is not None else b'', _to_bytes(end_key) if end_key else None)
+                 for start_key, end_key in ranges),
+                key=lambda range_: range_[0]
+        ):
+            if end_key is not None and end_key <= start_key:
+                continue
+            if merged_ranges:
+                last_start_key, last_end_key = merged_ranges[-1]
+                if last_end_key is None:
+                    break
+                if start_key <= last_end_key:
+                    if end_key is None or end_key > last_end_key:
+                        merged_ranges[-1] = (last_start_key, end_key)
+                    continue
+            merged_ranges.append((start_key, end_key))
+
+        self.prefetch_regions(table)
+        region_ranges = collections.OrderedDict()  # region name => list of (start_key, end_key)
+        for start_key, end_key in merged_ranges:
+            for region in self.locate_range(table, start_key, end_key):
+                sub_start_key = max(start_key, region.start_key)
+                sub_end_key = region.end_key if region.end_key != b'' else None
+                if end_key is not None and (sub_end_key is None or end_key < sub_end_key):
+                    sub_end_key = end_key
+                try:
+                    region_ranges[region.name].append((sub_start_key, sub_end_key))
+                except KeyError:
+                    region_ranges[region.name] = [(sub_start_key, sub_end_key)]
+
+        scanners = list()
+        for sub_ranges in region_ranges.values():
+            range_filter = filters.MultiRowRangeFilter([
+                (start_key, end_key if end_key is not None else b'')
+                for start_key, end_key in sub_ranges
+            ])
+            scanners.append(Scanner(
+                self,
+                table,
+                sub_ranges[0][0],
+                sub_ranges[-1][1],
+                columns if columns is not None else [],
+                filters.FilterList([range_filter, filter_]) if filter_ is not None else range_filter,
+                num_rows,
+                max_result_size,
+                row_factory=row_factory if row_factory is not None else self._row_factory
+            ))
+        return scanners
+
     def iter_scanner(self, scanner):
         """Iterate the scanner to get a batch of rows.
 
@@ -1224,61 +2247,283 @@ class Client(object):
         # }
         if scanner.__client__ != self:
             raise ValueError('Invalid scanner.')
-        if scanner.__scanner_id__ is not None:
+        with scanner.__lock__:
+            num_retries = 0
+            while True:
+                try:
+                    rows = self._iter_scanner(scanner)
+                    break
+                except (RegionError, TransportError, ScannerError) as e:
+                    if num_retries >= SCAN_RETRIES:
+                        raise e
+                    num_retries += 1
+                    if not isinstance(e, ScannerError):
+                        time.sleep(3)
+                    self._reopen_scanner(scanner)
+            scanner.__last_call_time__ = time.time()
+            if rows:
+                scanner.__last_key__ = _row_key(rows[-1])
+            return rows
+
+    def _reopen_scanner(self, scanner):
+        """Make the scanner reopen its region scanner just after the last row returned.
+
+        The region cache is refreshed, and the partial row is dropped since it will be read again.
+
+        Args:
+            scanner (Scanner): The scanner object.
+
+        Raises:
+            RequestError
+
+            TransportError
+            ZookeeperProtocolError
+            ServiceProtocolError
+            NoSuchZookeeperNodeError
+
+        """
+        scanner_id = scanner.__scanner_id__
+        region = scanner.__region__
+        if scanner_id is not None:
+            try:
+                self._close_region_scanner(region, self._region_manager.get_service(region), scanner_id)
+            except (RequestError, TransportError):
+                # the region scanner has gone with its region or server
+                pass
+        scanner.__scanner_id__ = None
+        scanner.__region__ = None
+        scanner.__partial_row__ = None
+
+        start_key = scanner.__current_start_key__
+        if start_key is None:
+            # the scan has finished
+            return
+        last_key = scanner.__last_key__
+        if scanner.__reversed__:
+            if last_key is not None and (start_key == b'' or last_key < start_key):
+                # start from the last row, which is skipped in the next iteration
+                scanner.__current_start_key__ = last_key
+                scanner.__start_exclusive__ = False
+        elif last_key is not None:
+            # the smallest key after the last row
+            next_key = last_key + b'\x00'
+            if next_key > start_key:
+                scanner.__current_start_key__ = next_key
+        self._locate_scanner_region(scanner, use_cache=False)
+
+    def _iter_scanner(self, scanner):
+        num_rows = scanner.__num_rows__
+        rows_left = scanner.__rows_left__
+        if rows_left is not None:
+            if rows_left <= 0:
+                return None
+            num_rows = min(num_rows, rows_left)
+
+        if scanner.__small__:
+            rows = self._iter_small_scanner(scanner, num_rows)
+        elif scanner.__scanner_id__ is not None:
             region = scanner.__region__
             assert region is not None
             region_service = self._region_manager.get_service(region)
-            pb_resp = self._scan_region_scanner(
+            pb_resp, cells = self._scan_region_scanner(
                 region,
                 region_service,
                 scanner.__scanner_id__,
-                scanner.__num_rows__
+                num_rows,
+                scanner.__max_result_size__ is not None,
+                scanner.__call_seq__
             )
+            scanner.__call_seq__ += 1
+            # a heartbeat message keeps the scan alive while the server is still filtering the rows
+            end_of_region = not (pb_resp.more_results_in_region or pb_resp.heartbeat_message)
+            rows = self._stitch_rows(scanner, pb_resp, cells, end_of_region)
 
-            if not pb_resp.more_results_in_region:
-                self._close_region_scanner(region, region_service, scanner.__scanner_id__)
+            if end_of_region:
+                try:
+                    self._close_region_scanner(region, region_service, scanner.__scanner_id__)
+                except (RequestError, TransportError):
+                    # the rows are good, the region scanner will expire by itself
+                    pass
                 scanner.__scanner_id__ = None
                 scanner.__region__ = None
-                next_start_key = region.end_key
-                end_key = scanner.__end_key__
-                scanner.__current_start_key__ = (
-                    next_start_key
-                    if next_start_key != '' and (end_key is None or next_start_key < end_key)
-                    else None
-                )
-
-            return [
-                self._cells_to_row(result.cell)
-                for result in pb_resp.results
-            ]
+                self._move_to_next_region(scanner, region)
         else:
             start_key = scanner.__current_start_key__
             if start_key is None:
                 return None
 
-            region = self._region_manager.get_region(scanner.__table__, start_key)
+            region = self._locate_scanner_region(scanner)
+            if region is None:
+                scanner.__current_start_key__ = None
+                return None
             region_service = self._region_manager.get_service(region)
             scanner.__region__ = region
 
-            pb_resp = self._create_region_scanner(
+            pb_resp, cells = self._create_region_scanner(
                 region,
                 region_service,
                 scanner.__table__,
                 start_key,
-                scanner.__end_key__,
+                self._region_end_key(scanner, region),
                 scanner.__columns__,
                 scanner.__filter___,
-                scanner.__num_rows__
+                num_rows,
+                reversed=scanner.__reversed__,
+                max_result_size=scanner.__max_result_size__,
+                retry=False
             )
             scanner.__scanner_id__ = pb_resp.scanner_id
+            scanner.__call_seq__ = 0
+
+            rows = self._stitch_rows(scanner, pb_resp, cells, False)
+
+        last_key = scanner.__last_key__
+        if scanner.__reversed__ and rows and last_key is not None and _row_key(rows[0]) == last_key:
+            # a reversed scan reopened from the last row returns it again
+            del rows[0]
+
+        if rows is None or rows_left is None:
+            return rows
+        if len(rows) >= rows_left:
+            # the limit is reached, no need to keep the region scanner
+            rows = rows[:rows_left]
+            if scanner.__scanner_id__ is not None:
+                region = scanner.__region__
+                region_service = self._region_manager.get_service(region)
+                try:
+                    self._close_region_scanner(region, region_service, scanner.__scanner_id__)
+                except (RequestError, TransportError):
+                    # the rows are good, the region scanner will expire by itself
+                    pass
+                scanner.__scanner_id__ = None
+                scanner.__region__ = None
+            scanner.__current_start_key__ = None
+        scanner.__rows_left__ = rows_left - len(rows)
+        return rows
 
-            return [
-                self._cells_to_row(result.cell)
-                for result in pb_resp.results
-            ]
+    def _iter_small_scanner(self, scanner, num_rows):
+        """Iterate a small scanner.
 
-    def delete_scanner(self, scanner):
-        """Delete the scanner.
+        Each iteration opens a region scanner, gets the rows and closes it in one request.
+        The next iteration starts just after the last row, or from the next region.
+
+        Args:
+            scanner (Scanner): The scanner object.
+            num_rows (int): Number of rows returned in this iteration.
+
+        Returns:
+            list[Row]: List of rows.
+            None: There is no more rows.
+
+        Raises:
+            RegionError
+            RequestError
+
+            TransportError
+            ZookeeperProtocolError
+            ServiceProtocolError
+            NoSuchZookeeperNodeError
+
+        """
+        start_key = scanner.__current_start_key__
+        if start_key is None:
+            return None
+
+        region = self._locate_scanner_region(scanner)
+        if region is None:
+            scanner.__current_start_key__ = None
+            return None
+        region_service = self._region_manager.get_service(region)
+        if scanner.__reversed__ and not scanner.__start_exclusive__ and start_key == scanner.__last_key__:
+            # the first row is the last one returned, which is skipped, so ask for one more row
+            num_rows += 1
+        pb_resp, cells = self._create_region_scanner(
+            region,
+            region_service,
+            scanner.__table__,
+            start_key,
+            self._region_end_key(scanner, region),
+            scanner.__columns__,
+            scanner.__filter___,
+            num_rows,
+            reversed=scanner.__reversed__,
+            small=True,
+            retry=False
+        )
+        rows = self._results_to_rows(pb_resp, cells, scanner.__row_factory__)
+
+        if pb_resp.HasField('more_results_in_region'):
+            more_results = pb_resp.more_results_in_region
+        else:
+            more_results = len(rows) >= num_rows
+        if not more_results:
+            self._move_to_next_region(scanner, region)
+        elif len(rows) > 0:
+            if scanner.__reversed__:
+                # start from the last row, which is skipped in the next iteration
+                scanner.__current_start_key__ = _row_key(rows[-1])
+                scanner.__start_exclusive__ = False
+            else:
+                # the smallest key after the last row
+                scanner.__current_start_key__ = _row_key(rows[-1]) + b'\x00'
+        return rows
+
+    @staticmethod
+    def _move_to_next_region(scanner, region):
+        end_key = scanner.__end_key__
+        if scanner.__reversed__:
+            # the previous region ends at the start key of this one
+            next_start_key = region.start_key
+            scanner.__current_start_key__ = (
+                next_start_key
+                if next_start_key != b'' and (not end_key or next_start_key > end_key)
+                else None
+            )
+            scanner.__start_exclusive__ = True
+            return
+        next_start_key = region.end_key
+        scanner.__current_start_key__ = (
+            next_start_key
+            if next_start_key != b'' and (end_key is None or next_start_key < end_key)
+            else None
+        )
+
+    @staticmethod
+    def _region_end_key(scanner, region):
+        end_key = scanner.__end_key__
+        if scanner.__end_inclusive__ and end_key <= region.start_key:
+            # a reversed scanner split by regions stops at the start of the region, which is included
+            # note that if the regions have been merged, the scan still stops before the end key
+            return None
+        return end_key
+
+    def _locate_scanner_region(self, scanner, use_cache=True):
+        """Find the region where the scanner continues.
+
+        Args:
+            scanner (Scanner): The scanner object.
+            use_cache (bool): Search the region cache first.
+
+        Returns:
+            _region.Region: The region.
+            None: There is no more region for a reversed scan.
+
+        Raises:
+            RequestError
+
+            TransportError
+            ZookeeperProtocolError
+            ServiceProtocolError
+            NoSuchZookeeperNodeError
+
+        """
+        start_key = scanner.__current_start_key__
+        if scanner.__reversed__ and (start_key == b'' or scanner.__start_exclusive__):
+            return self._region_manager.get_region_before(scanner.__table__, start_key, use_cache)
+        return self._region_manager.get_region(scanner.__table__, start_key, use_cache)
+
+    def renew_scanner(self, scanner):
+        """Renew the lease of the region scanner, so that it is not expired while the scanner is idle.
 
         Args:
             scanner (Scanner): The scanner object.
@@ -1295,15 +2540,55 @@ class Client(object):
         """
         if scanner.__client__ != self:
             raise ValueError('Invalid scanner.')
-        scanner_id = scanner.__scanner_id__
-        if scanner_id is not None:
+        with scanner.__lock__:
+            scanner_id = scanner.__scanner_id__
+            if scanner_id is None:
+                return
             region = scanner.__region__
             region_service = self._region_manager.get_service(region)
-            self._close_region_scanner(
-                region,
-                region_service,
-                scanner_id
-            )
+
+            pb_req = protobuf.ScanRequest()
+
+            pb_req.region.type = 1
+            pb_req.region.value = region.name
+
+            pb_req.scanner_id = scanner_id
+            pb_req.number_of_rows = 0
+            pb_req.next_call_seq = scanner.__call_seq__
+            pb_req.renew = True
+
+            region_service.request(pb_req, with_cells=True)
+            scanner.__call_seq__ += 1
+            scanner.__last_call_time__ = time.time()
+
+    def delete_scanner(self, scanner):
+        """Delete the scanner.
+
+        Args:
+            scanner (Scanner): The scanner object.
+
+        Raises:
+            RegionError
+            RequestError
+
+            TransportError
+            ZookeeperProtocolError
+            ServiceProtocolError
+            NoSuchZookeeperNodeError
+
+        """
+        if scanner.__client__ != self:
+            raise ValueError('Invalid scanner.')
+        with scanner.__lock__:
+            scanner_id = scanner.__scanner_id__
+            if scanner_id is not None:
+                region = scanner.__region__
+                region_service = self._region_manager.get_service(region)
+                self._close_region_scanner(
+                    region,
+                    region_service,
+                    scanner_id
+                )
 
     def _create_region_scanner(self,
                                region,
@@ -1314,22 +2599,30 @@ class Client(object):
                                columns,
                                filter_,
                                num_rows,
-                               reversed=False):
+                               reversed=False,
+                               max_result_size=None,
+                               small=False,
+                               retry=True):
         """Create a scanner on a region and return the first iteration results.
 
         Args:
             region (_region.Region): The region object.
             region_service (services.RegionService): The region service.
             table (str): Table name.
-            start_key (str|None): Start key.
-            end_key (str|None): End key.
+            start_key (bytes|None): Start key.
+            end_key (bytes|None): End key.
             columns (list[str]|tuple[str]|None): Name of the columns to query.
                 This is similar to the projection operation in SQL.
             filter_ (filters.Filter|None): The filter object.
             num_rows (int): Number of rows returned in every iteration.
+            reversed (bool): Scan in reversed order.
+            max_result_size (int|None): Max number of bytes returned in every iteration.
+                If it is given, the region server may return parts of a row.
+            small (bool): Small scan. The region scanner is closed after the first iteration.
+            retry (bool): Relocate the region by the start key and retry on region errors.
 
         Returns:
-            The protocol response object.
+            tuple: (The protocol response object, list of cells in the cell block)
 
         Raises:
             RegionError
@@ -1345,23 +2638,23 @@ class Client(object):
         pb_req = protobuf.ScanRequest()
 
         pb_req.region.type = 1
-        pb_req.region.value = region.name.encode()
+        pb_req.region.value = region.name
 
         # start_key and end_key
         pb_scan = pb_req.scan
         if start_key is not None:
-            pb_scan.start_row = start_key.encode()
+            pb_scan.start_row = start_key
         if end_key is not None:
-            pb_scan.stop_row = end_key.encode()
+            pb_scan.stop_row = end_key
 
         # columns
         if columns is not None:
             pb_columns = pb_scan.column
             for column in columns:
-                family, qualifier = self._split_name(column)
+                family, qualifier = _split_column(column)
                 pb_column = pb_columns.add()
                 pb_column.family = family
-                pb_column.qualifier = qualifier
+                pb_column.qualifier.append(qualifier)
 
         # filter
         if filter_ is not None:
@@ -1375,9 +2668,24 @@ class Client(object):
         # reversed
         pb_scan.reversed = reversed
 
+        # size limit, rows larger than it are returned in parts
+        if max_result_size is not None:
+            pb_scan.max_result_size = max_result_size
+            pb_scan.allow_partial_results = True
+            pb_req.client_handles_partials = True
+
+        # small scan, open and close the region scanner in one request
+        if small:
+            pb_scan.small = True
+            pb_req.close_scanner = True
+        else:
+            pb_req.client_handles_heartbeats = True
+
         try:
-            return region_service.request(pb_req)
+            return region_service.request(pb_req, with_cells=True)
         except RegionError:
+            if not retry:
+                raise
             while True:
                 time.sleep(3)
                 # print('DEBUG: put() RegionError')
@@ -1385,11 +2693,11 @@ class Client(object):
                 # refresh the region information and retry the operation
                 region = self._region_manager.get_region(table, start_key, use_cache=False)
                 region_service = self._region_manager.get_service(region)
-                pb_req.region.value = region.name.encode()
+                pb_req.region.value = region.name
                 # if the new region still doesn't work, it is a fatal error
                 # print(repr(region))
                 try:
-                    pb_resp = region_service.request(pb_req)
+                    pb_resp = region_service.request(pb_req, with_cells=True)
                     break
                 except RegionError:
                     continue
@@ -1399,7 +2707,9 @@ class Client(object):
     def _scan_region_scanner(region,
                              region_service,
                              scanner_id,
-                             num_rows):
+                             num_rows,
+                             handles_partials=False,
+                             call_seq=None):
         """Iterate the region scanner.
 
         Args:
@@ -1407,9 +2717,11 @@ class Client(object):
             region_service (services.RegionService): The region service.
             scanner_id (int): The region scanner ID.
             num_rows (int): Number of rows returned in every iteration.
+            handles_partials (bool): The client accepts parts of a row.
+            call_seq (int|None): Sequence number of the call, which lets the server detect retried calls.
 
         Returns:
-            The protocol response object.
+            tuple: (The protocol response object, list of cells in the cell block)
 
         Raises:
             RegionError
@@ -1424,12 +2736,17 @@ class Client(object):
         pb_req = protobuf.ScanRequest()
 
         pb_req.region.type = 1
-        pb_req.region.value = region.name.encode()
+        pb_req.region.value = region.name
 
         pb_req.number_of_rows = num_rows
         pb_req.scanner_id = scanner_id
+        if handles_partials:
+            pb_req.client_handles_partials = True
+        if call_seq is not None:
+            pb_req.next_call_seq = call_seq
+        pb_req.client_handles_heartbeats = True
 
-        return region_service.request(pb_req)
+        return region_service.request(pb_req, with_cells=True)
 
     @staticmethod
     def _close_region_scanner(region,
@@ -1459,13 +2776,89 @@ class Client(object):
         pb_req = protobuf.ScanRequest()
 
         pb_req.region.type = 1
-        pb_req.region.value = region.name.encode()
+        pb_req.region.value = region.name
 
         pb_req.scanner_id = scanner_id
         pb_req.close_scanner = True
 
         return region_service.request(pb_req)
 
+    @staticmethod
+    def _results_to_rows(pb_resp, cells, row_factory=None):
+        """Convert the results of a scan response to rows.
+
+        Args:
+            pb_resp: The protocol scan response object.
+            cells (list[services.codec.Cell]): Cells in the cell block of the response.
+                When cell block is used, the result messages are empty and
+                "cells_per_result" tells how many cells belong to each result.
+            row_factory ((list[services.codec.Cell]) -> T): Function to make a row from its cells.
+                None means Client._cells_to_row.
+
+        Returns:
+            list[Row]: List of rows.
+
+        """
+        if row_factory is None:
+            row_factory = Client._cells_to_row
+        if not cells:
+            return [
+                row_factory(result.cell)
+                for result in pb_resp.results
+            ]
+        rows = list()
+        start = 0
+        for num_cells in pb_resp.cells_per_result:
+            end = start + num_cells
+            rows.append(row_factory(cells[start:end]))
+            start = end
+        return rows
+
+    def _stitch_rows(self, scanner, pb_resp, cells, end_of_region):
+        """Convert the results of a scan response to rows, and stitch the partial results.
+
+        A partial result is kept in the scanner until the rest of the row arrives.
+
+        Args:
+            scanner (Scanner): The scanner object.
+            pb_resp: The protocol scan response object.
+            cells (list[services.codec.Cell]): Cells in the cell block of the response.
+            end_of_region (bool): It is the last response of the region scanner.
+
+        Returns:
+            list[Row]: List of complete rows.
+
+        """
+        rows = self._results_to_rows(pb_resp, cells, scanner.__row_factory__)
+        if cells:
+            partial_flags = pb_resp.partial_flag_per_result
+        else:
+            partial_flags = [result.partial for result in pb_resp.results]
+        partial_row = scanner.__partial_row__
+        if partial_row is None and not any(partial_flags):
+            return rows
+
+        complete_rows = list()
+        for row, partial in zip(rows, partial_flags):
+            if row is None:
+                continue
+            if partial_row is not None:
+                if _row_key(partial_row) == _row_key(row):
+                    partial_row.update(row)
+                    row = partial_row
+                else:
+                    complete_rows.append(partial_row)
+                partial_row = None
+            if partial:
+                partial_row = row
+            else:
+                complete_rows.append(row)
+        if end_of_region and partial_row is not None:
+            complete_rows.append(partial_row)
+            partial_row = None
+        scanner.__partial_row__ = partial_row
+        return complete_rows
+
     @staticmethod
     def _cells_to_row(pb_cells):
         if len(pb_cells) < 1:
@@ -1476,6 +2869,15 @@ class Client(object):
         })
         return doc
 
+    @staticmethod
+    def _cells_to_binary_row(pb_cells):
+        if len(pb_cells) < 1:
+            return None
+        return Row(pb_cells[0].row, {
+            pb_cell.family + b':' + pb_cell.qualifier: pb_cell.value
+            for pb_cell in pb_cells
+        })
+
     @staticmethod
     def _cells_to_rows(_pb_cells):
         if len(_pb_cells) < 1:
@@ -1494,12 +2896,274 @@ class Client(object):
         row_list = [row for row in row_dict.values()]
         return row_list
 
+    def aggregate(self,
+                  table,
+                  op,
+                  column=None,
+                  start_key=None,
+                  end_key=None,
+                  filter_=None,
+                  max_in_flight=4):
+        """Aggregate a column with the aggregate coprocessor of the regions.
+
+        The values are read as 8 bytes signed big endian integers, as LongColumnInterpreter does,
+        and cells of other sizes are ignored. Every region computes its part, and the parts are combined
+        by the client. The regions need the org.apache.hadoop.hbase.coprocessor.AggregateImplementation
+        coprocessor. Median is not supported.
+
+        Args:
+            table (str): Table name.
+            op (str): One of {'count', 'sum', 'min', 'max', 'avg', 'std'}.
+            column (str|None): The column to aggregate. It is required except for 'count'.
+                For 'count', None means count all the rows, otherwise the rows having the column.
+            start_key (str|bytes|None): Start key.
+            end_key (str|bytes|None): End key.
+            filter_ (filters.Filter|None): The filter object.
+            max_in_flight (int): Max number of requests in flight to each region server.
+
+        Returns:
+            int|float|None: The result. None if there is no value, except that count returns 0.
+
+        Raises:
+            ValueError: Unsupported aggregation or missing column.
+            UnknownServiceError: The coprocessor is not loaded.
+            RegionError
+            RequestError
+
+            TransportError
+            ZookeeperProtocolError
+            ServiceProtocolError
+            NoSuchZookeeperNodeError
+
+        """
+        try:
+            method_name = AGGREGATE_METHODS[op]
+        except KeyError:
+            raise ValueError(
+                'Unsupported aggregation %s. It should be one of %s.' % (op, str(sorted(AGGREGATE_METHODS)))
+            )
+        if column is None and op != 'count':
+            raise ValueError('A column is required by %s.' % op)
+
+        #
+        # message AggregateRequest {
+        #   required string interpreter_class_name = 1;
+        #   required Scan scan = 2;
+        #   optional bytes interpreter_specific_bytes = 3;
+        # }
+        # message AggregateResponse {
+        #   repeated bytes first_part = 1;
+        #   optional bytes second_part = 2;
+        # }
+        def make_request(sub_start_key, sub_end_key):
+            pb_req = protobuf.AggregateRequest()
+            pb_req.interpreter_class_name = LONG_COLUMN_INTERPRETER
+            pb_scan = pb_req.scan
+            pb_scan.start_row = sub_start_key
+            if sub_end_key is not None:
+                pb_scan.stop_row = sub_end_key
+            if column is not None:
+                family, qualifier = _split_column(column)
+                pb_column = pb_scan.column.add()
+                pb_column.family = family
+                pb_column.qualifier.append(qualifier)
+            if filter_ is not None:
+                pb_scan.filter.name = filter_.name
+                pb_scan.filter.serialized_filter = filter_.serialize()
+            return pb_req.SerializeToString()
+
+        aggregator = Aggregator(op)
+        for _, resp_bytes in self._iter_exec_service(
+                table,
+                start_key,
+                end_key,
+                AGGREGATE_SERVICE,
+                method_name,
+                make_request,
+                max_in_flight
+        ):
+            pb_resp = protobuf.AggregateResponse()
+            pb_resp.ParseFromString(resp_bytes)
+            if op == 'count':
+                # the row count is a raw long instead of a LongMsg
+                if len(pb_resp.first_part) > 0:
+                    aggregator.add(None, _long.unpack(pb_resp.first_part[0])[0])
+                continue
+            if len(pb_resp.first_part) == 0:
+                # no value in the region
+                continue
+            part = self._parse_long_msg(pb_resp.first_part[0])
+            if op in ('avg', 'std'):
+                square_sum = self._parse_long_msg(pb_resp.first_part[1]) if op == 'std' else 0
+                aggregator.add(part, _long.unpack(pb_resp.second_part)[0], square_sum)
+            else:
+                # the count is not used by min, max and sum
+                aggregator.add(part)
+        return aggregator.result()
+
+    @staticmethod
+    def _parse_long_msg(data):
+        pb_msg = protobuf.LongMsg()
+        pb_msg.ParseFromString(data)
+        return pb_msg.long_msg
+
+    def coprocessor_exec(self,
+                         table,
+                         service_name,
+                         method_name,
+                         request,
+                         response_type=None,
+                         start_key=None,
+                         end_key=None,
+                         max_in_flight=4):
+        """Call a coprocessor endpoint on every region of a key range.
+
+        The calls are sent to the region servers concurrently, and the responses are yielded as they complete.
+        When a region fails with a region error, e.g., it has been split or moved, its key range is located
+        again and the endpoint is called on the new regions.
+
+        Args:
+            table (str): Table name.
+            service_name (str): Full name of the coprocessor service, e.g., 'AggregateService' or
+                'hbase.pb.AggregateService', depending on the package of the service's proto file.
+            method_name (str): Method name of the service.
+            request (bytes|google.protobuf.message.Message): The request message. It is sent to every region.
+            response_type (type|None): Protobuf message class to parse the responses.
+                None means to return the serialized responses.
+            start_key (str|bytes|None): Start key.
+            end_key (str|bytes|None): End key (exclusive).
+            max_in_flight (int): Max number of requests in flight to each region server.
+
+        Yields:
+            tuple: (region, response). The response is a response_type object, or bytes if response_type is None.
+
+        Raises:
+            UnknownServiceError: The coprocessor service is not loaded.
+            RegionError
+            RequestError
+
+            TransportError
+            ZookeeperProtocolError
+            ServiceProtocolError
+            NoSuchZookeeperNodeError
+
+        """
+        if not isinstance(request, bytes):
+            request = request.SerializeToString()
+        for region, resp_bytes in self._iter_exec_service(
+                table,
+                start_key,
+                end_key,
+                service_name,
+                method_name,
+                lambda _sub_start_key, _sub_end_key: request,
+                max_in_flight
+        ):
+            if response_type is None:
+                yield region, resp_bytes
+            else:
+                resp = response_type()
+                resp.ParseFromString(resp_bytes)
+                yield region, resp
+
+    def _iter_exec_service(self,
+                           table,
+                           start_key,
+                           end_key,
+                           service_name,
+                           method_name,
+                           make_request,
+                           max_in_flight):
+        """Call a coprocessor service method on every region of a key range.
+
+        The calls are sent to the region servers concurrently. When a region fails with a region error,
+        e.g., it has been split or moved, its key range is located again and retried.
+
+        Args:
+            table (str): Table name.
+            start_key (str|bytes|None): Start key.
+            end_key (str|bytes|None): End key.
+            service_name (str): Coprocessor service name, e.g., 'AggregateService'.
+            method_name (str): Method name of the service.
+            make_request ((bytes, bytes|None) -> bytes): Function to make the serialized request message
+                for the part of the key range in a region, given its start key and end key.
+            max_in_flight (int): Max number of requests in flight to each region server.
+
+        Yields:
+            tuple: (region, serialized response message) in completion order.
+
+        Raises:
+            UnknownServiceError: The coprocessor service is not loaded.
+            RegionError
+            RequestError
+
+            TransportError
+            ZookeeperProtocolError
+            ServiceProtocolError
+            NoSuchZookeeperNodeError
+
+        """
+        #
+        # message CoprocessorServiceRequest {
+        #   required RegionSpecifier region = 1;
+        #   required CoprocessorServiceCall call = 2;
+        # }
+        # message CoprocessorServiceCall {
+        #   required bytes row = 1;
+        #   required string service_name = 2;
+        #   required string method_name = 3;
+        #   required bytes request = 4;
+        # }
+        # message CoprocessorServiceResponse {
+        #   required RegionSpecifier region = 1;
+        #   required NameBytesPair value = 2;
+        # }
+        self.prefetch_regions(table)
+        pending = [(_to_bytes(start_key) if start_key is not None else b'', _to_bytes(end_key) if end_key else None)]
+        for retry in range(MULTI_RETRIES + 1):
+            if retry > 0:
+                time.sleep(3)
+            calls = dict()
+            for range_start_key, range_end_key in pending:
+                for region in self.locate_range(table, range_start_key, range_end_key, retry == 0):
+                    sub_start_key = max(range_start_key, region.start_key)
+                    sub_end_key = region.end_key if region.end_key != b'' else None
+                    if range_end_key is not None and (sub_end_key is None or range_end_key < sub_end_key):
+                        sub_end_key = range_end_key
+                    pb_req = protobuf.CoprocessorServiceRequest()
+                    pb_req.region.type = 1
+                    pb_req.region.value = region.name
+                    pb_call = pb_req.call
+                    pb_call.row = sub_start_key
+                    pb_call.service_name = service_name
+                    pb_call.method_name = method_name
+                    pb_call.request = make_request(sub_start_key, sub_end_key)
+                    region_service = self._region_manager.get_service(region)
+                    calls.setdefault((region.host, region.port), collections.deque()).append(
+                        (region_service, pb_req, None, (region, sub_start_key, sub_end_key))
+                    )
+
+            pending = list()
+            last_error = None
+            for context, pb_resp, error in self._fan_out(calls, max_in_flight):
+                if error is None:
+                    yield context[0], pb_resp.value.value
+                elif isinstance(error, (RegionError, TransportError)):
+                    pending.append(context[1:])
+                    last_error = error
+                else:
+                    raise error
+            if not pending:
+                break
+        else:
+            raise last_error
+
     def delete(self, table, key):
         """Delete a row.
 
         Args:
             table (str): Table name.
-            key (str): Row key.
+            key (str|bytes): Row key.
 
         Raises:
             RegionError
@@ -1511,16 +3175,17 @@ class Client(object):
             NoSuchZookeeperNodeError
 
         """
+        key = _to_bytes(key)
         region = self._region_manager.get_region(table, key)
         region_service = self._region_manager.get_service(region)
 
         pb_req = protobuf.MutateRequest()
 
         pb_req.region.type = 1
-        pb_req.region.value = region.name.encode()
+        pb_req.region.value = region.name
 
         pb_mutation = pb_req.mutation
-        pb_mutation.row = key.encode()
+        pb_mutation.row = key
         pb_mutation.mutate_type = 3
 
         #
@@ -1536,7 +3201,7 @@ class Client(object):
             # refresh the region information and retry the operation
             region = self._region_manager.get_region(table, key, use_cache=False)
             region_service = self._region_manager.get_service(region)
-            pb_req.region.value = region.name.encode()
+            pb_req.region.value = region.name
             # if the new region still doesn't work, it is a fatal error
             pb_resp = region_service.request(pb_req)
         return pb_resp.processed
@@ -1551,6 +3216,48 @@ class Client(object):
         return name_qualifier
 
 
+class LeaseRenewer(object):
+
+    def __init__(self, client, scanners, interval):
+        """Renew the leases of idle scanners in background.
+
+        A scanner is renewed when it has not been iterated for interval seconds.
+        The renewer holds no reference to the cursor, so a cursor can be collected while its renewer runs.
+
+        Args:
+            client (Client): The client.
+            scanners (list[Scanner]): The scanners.
+            interval (float): Idle seconds before renewing. It should be less than the scanner lease period
+                of the region servers (hbase.client.scanner.timeout.period, 60 seconds by default).
+
+        """
+        if interval <= 0:
+            raise ValueError('interval should be positive value.')
+        self._client = client
+        self._scanners = scanners
+        self._interval = interval
+
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._target, name='hbase-lease-renewer')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _target(self):
+        while not self._stop_event.wait(self._interval / 2):
+            now = time.time()
+            for scanner in self._scanners:
+                if scanner.__scanner_id__ is None or now - scanner.__last_call_time__ < self._interval:
+                    continue
+                try:
+                    self._client.renew_scanner(scanner)
+                except Exception:
+                    # the error is raised by the next iteration of the scanner
+                    pass
+
+    def stop(self):
+        self._stop_event.set()
+
+
 class Scanner(object):
 
     def __init__(self,
@@ -1560,7 +3267,12 @@ class Scanner(object):
                  end_key,
                  columns,
                  filter_,
-                 num_rows):
+                 num_rows,
+                 max_result_size=None,
+                 limit=None,
+                 small=False,
+                 reversed=False,
+                 row_factory=None):
         self.__client__ = client
         self.__table__ = table
         self.__start_key__ = start_key
@@ -1568,7 +3280,20 @@ class Scanner(object):
         self.__columns__ = columns
         self.__filter___ = filter_
         self.__num_rows__ = num_rows
+        self.__max_result_size__ = max_result_size
+        self.__limit__ = limit
+        self.__small__ = small
+        self.__reversed__ = reversed
+        self.__row_factory__ = row_factory
 
         self.__current_start_key__ = start_key
         self.__scanner_id__ = None
         self.__region__ = None
+        self.__partial_row__ = None
+        self.__rows_left__ = limit
+        self.__call_seq__ = 0
+        self.__last_call_time__ = time.time()
+        self.__last_key__ = None
+        self.__start_exclusive__ = False
+        self.__end_inclusive__ = False
+        self.__lock__ = threading.Semaphore(1)
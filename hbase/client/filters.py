@@ -18,6 +18,11 @@ GREATER_OR_EQUAL = 4
 GREATER = 5
 NO_OP = 6
 
+#
+# FilterList.Operator
+MUST_PASS_ALL = 1
+MUST_PASS_ONE = 2
+
 
 class Filter(object):
 
@@ -48,6 +53,76 @@ class KeyOnlyFilter(Filter):
         return pb_filter.SerializeToString()
 
 
+class FilterList(Filter):
+
+    def __init__(self, filters, operator=MUST_PASS_ALL):
+        """A list of filters.
+
+        Args:
+            filters (list[Filter]|tuple[Filter]): The filters.
+            operator (int): MUST_PASS_ALL or MUST_PASS_ONE.
+
+        """
+        super(FilterList, self).__init__('FilterList')
+        self._filters = filters
+        self._operator = operator
+
+    def serialize(self):
+        #
+        # message FilterList {
+        #   required Operator operator = 1;
+        #   repeated Filter filters = 2;
+        #
+        #   enum Operator {
+        #     MUST_PASS_ALL = 1;
+        #     MUST_PASS_ONE = 2;
+        #   }
+        # }
+        pb_filter = protobuf.FilterList()
+        pb_filter.operator = self._operator
+        for filter_ in self._filters:
+            pb_sub_filter = pb_filter.filters.add()
+            pb_sub_filter.name = filter_.name
+            pb_sub_filter.serialized_filter = filter_.serialize()
+        return pb_filter.SerializeToString()
+
+
+class MultiRowRangeFilter(Filter):
+
+    def __init__(self, ranges):
+        """Filter the rows in several key ranges.
+
+        The region server seeks from one range to the next, so the rows between the ranges are not read.
+
+        Args:
+            ranges (list[tuple[str|bytes, str|bytes]]): Sorted and non-overlapping (start_row, stop_row) pairs.
+                The start rows are inclusive and the stop rows are exclusive. An empty stop row means no limit.
+
+        """
+        super(MultiRowRangeFilter, self).__init__('MultiRowRangeFilter')
+        self._ranges = ranges
+
+    def serialize(self):
+        #
+        # message MultiRowRangeFilter {
+        #   repeated RowRange row_range_list = 1;
+        # }
+        # message RowRange {
+        #   optional bytes start_row = 1;
+        #   optional bool start_row_inclusive = 2;
+        #   optional bytes stop_row = 3;
+        #   optional bool stop_row_inclusive = 4;
+        # }
+        pb_filter = protobuf.MultiRowRangeFilter()
+        for start_row, stop_row in self._ranges:
+            pb_range = pb_filter.row_range_list.add()
+            pb_range.start_row = _to_bytes(start_row)
+            pb_range.start_row_inclusive = True
+            pb_range.stop_row = _to_bytes(stop_row)
+            pb_range.stop_row_inclusive = False
+        return pb_filter.SerializeToString()
+
+
 class Comparator(object):
 
     def __init__(self, name):
@@ -146,3 +221,7 @@ class NullComparator(Comparator):
         # }
         pb_comp = protobuf.NullComparator()
         return pb_comp.SerializeToString()
+
+
+def _to_bytes(value):
+    return value.encode() if isinstance(value, str) else bytes(value)
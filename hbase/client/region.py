@@ -5,14 +5,13 @@
 @since: 2018-05-18
 """
 
-import io
+import bisect
 import struct
 import threading
 import time
 
 from hbase import protobuf
 from hbase import services, exceptions
-from hbase.client import rbtree
 
 
 class Region(object):
@@ -26,11 +25,13 @@ class Region(object):
                  port):
         """Region information.
 
+        The region name and the keys are bytes, and they are compared byte by byte as the region servers do.
+
         Args:
-            name (str): Region name.
+            name (bytes): Region name.
             table (str): Table name.
-            start_key (str): Start key.
-            end_key (str): End key.
+            start_key (bytes): Start key.
+            end_key (bytes): End key.
             host (str): Hostname or IP address.
             port (int): Port number.
 
@@ -43,34 +44,19 @@ class Region(object):
         self._port = port
 
         self._server_info = host + ':' + str(port)
-        self._start_value = table + ',' + start_key
-        self._end_value = table + ',' + (end_key if len(end_key) != 0 else '\xff')
 
     def __str__(self):
-        buffer = io.StringIO()
-        buffer.write(self._start_key)
-        buffer.write(' ~ ')
-        buffer.write(self._end_key)
-        return buffer.getvalue()
+        return '%s ~ %s' % (_to_str(self._start_key), _to_str(self._end_key))
 
     def __repr__(self):
-        buffer = io.StringIO()
-        buffer.write('Region: ')
-        buffer.write(self._name)
-        buffer.write('\n')
-        buffer.write('Table: ')
-        buffer.write(self._table)
-        buffer.write('\n')
-        buffer.write('Range: ')
-        buffer.write(self._start_key)
-        buffer.write(' ~ ')
-        buffer.write(self._end_key)
-        buffer.write('\n')
-        buffer.write('Server: ')
-        buffer.write(self._host)
-        buffer.write(':')
-        buffer.write(str(self._port))
-        return buffer.getvalue()
+        return 'Region: %s\nTable: %s\nRange: %s ~ %s\nServer: %s:%d' % (
+            _to_str(self._name),
+            self._table,
+            _to_str(self._start_key),
+            _to_str(self._end_key),
+            self._host,
+            self._port
+        )
 
     @property
     def name(self):
@@ -100,50 +86,156 @@ class Region(object):
     def server_info(self):
         return self._server_info
 
-    @property
-    def start_value(self):
-        return self._start_value
+    def contains(self, key):
+        """Check if a row key falls in the region.
 
-    @property
-    def end_value(self):
-        return self._end_value
-
-    def __lt__(self, other):
-        # print('DEBUG: __lt__')
-        if isinstance(other, str):
-            return self._end_value <= other
-        elif isinstance(other, Region):
-            return self._end_value <= other._start_value
-        else:
-            raise TypeError(
-                'Region or str expected, got %s.' % str(type(other))
-            )
+        Args:
+            key (bytes): Row key.
 
-    def __gt__(self, other):
-        # print('DEBUG: __gt__')
-        if isinstance(other, str):
-            return self._start_value > other
-        elif isinstance(other, Region):
-            return self._start_value >= other._end_value
-        else:
-            raise TypeError(
-                'Region or str expected, got %s.' % str(type(other))
-            )
+        Returns:
+            bool: True if start_key <= key < end_key.
+
+        """
+        return self._start_key <= key and (len(self._end_key) == 0 or key < self._end_key)
+
+
+class RegionIndex(object):
+
+    def __init__(self):
+        """Regions of one table sorted by start key.
+
+        The start keys are kept in a sorted list, and a region is found by bisecting it.
+        The regions in the index never overlap: adding a region drops the cached regions it overlaps,
+        e.g., the parent of a split region.
+
+        """
+        self._start_keys = list()
+        self._regions = list()
 
-    def __eq__(self, other):
-        if isinstance(other, str):
-            return self._start_value <= other < self._end_value
-        elif isinstance(other, Region):
-            return self._start_value == other._start_value and self._end_value == other._end_value
+    def __len__(self):
+        return len(self._regions)
+
+    def __iter__(self):
+        return iter(self._regions)
+
+    def find(self, key):
+        """Find the region which a row key falls in.
+
+        Args:
+            key (bytes): Row key.
+
+        Returns:
+            Region: The region.
+            None: The region is not in the index.
+
+        """
+        i = bisect.bisect_right(self._start_keys, key) - 1
+        if i < 0:
+            return None
+        region = self._regions[i]
+        end_key = region.end_key
+        if end_key == b'' or key < end_key:
+            return region
+        return None
+
+    def find_before(self, key):
+        """Find the region which has the largest row keys less than a row key.
+
+        Args:
+            key (bytes): Row key. b'' means the end of the table.
+
+        Returns:
+            Region: The region.
+            None: The region is not in the index.
+
+        """
+        if key == b'':
+            if self._regions and self._regions[-1].end_key == b'':
+                return self._regions[-1]
+            return None
+        i = bisect.bisect_left(self._start_keys, key) - 1
+        if i < 0:
+            return None
+        region = self._regions[i]
+        end_key = region.end_key
+        if end_key == b'' or key <= end_key:
+            return region
+        return None
+
+    def add(self, region):
+        """Add a region, and drop the regions it overlaps.
+
+        Args:
+            region (Region): The region.
+
+        """
+        lo, hi = self._overlap(region.start_key, region.end_key)
+        self._start_keys[lo:hi] = [region.start_key]
+        self._regions[lo:hi] = [region]
+
+    def add_all(self, regions):
+        """Add regions in one pass, e.g., the regions of a meta scan.
+
+        Args:
+            regions (list[Region]): Non-overlapping regions.
+
+        """
+        regions = sorted(regions, key=lambda region_: region_.start_key)
+        kept = list()
+        next_index = 0
+        for region in self._regions:
+            # keep the cached regions which do not overlap any new region
+            while next_index < len(regions) and regions[next_index].end_key != b'' \
+                    and regions[next_index].end_key <= region.start_key:
+                next_index += 1
+            if next_index < len(regions):
+                new_region = regions[next_index]
+                if region.end_key == b'' or region.end_key > new_region.start_key:
+                    continue
+            kept.append(region)
+        kept.extend(regions)
+        kept.sort(key=lambda region_: region_.start_key)
+        self._regions = kept
+        self._start_keys = [region.start_key for region in kept]
+
+    def remove(self, key):
+        """Remove the region which a row key falls in.
+
+        Args:
+            key (bytes): Row key.
+
+        Returns:
+            Region: The region removed.
+            None: The region is not in the index.
+
+        """
+        i = bisect.bisect_right(self._start_keys, key) - 1
+        if i < 0:
+            return None
+        region = self._regions[i]
+        if region.end_key != b'' and key >= region.end_key:
+            return None
+        del self._start_keys[i]
+        del self._regions[i]
+        return region
+
+    def _overlap(self, start_key, end_key):
+        # index range of the regions overlapping [start_key, end_key)
+        lo = bisect.bisect_right(self._start_keys, start_key)
+        if lo > 0:
+            previous_end_key = self._regions[lo - 1].end_key
+            if previous_end_key == b'' or previous_end_key > start_key:
+                lo -= 1
+        if end_key == b'':
+            hi = len(self._start_keys)
         else:
-            raise TypeError(
-                'Region or str expected, got %s.' % str(type(other))
-            )
+            hi = bisect.bisect_left(self._start_keys, end_key, lo)
+        return lo, hi
 
 
 class RegionManager(object):
 
-    def __init__(self, zkquorum, zkpath=None):
+    def __init__(self, zkquorum, zkpath=None, codec=None, compressor=None):
         """Region manager.
 
         A region manager is used to:
@@ -154,6 +246,9 @@ class RegionManager(object):
         Args:
             zkquorum (str): Zookeeper quorum. Comma-separated list of hosts to connect to.
                 e.g., '127.0.0.1:2181,127.0.0.1:2182,[::1]:2183'
+            zkpath (str): Zookeeper path of the meta region server.
+            codec (str|None): Cell block codec class used by the region services.
+            compressor (str|None): Cell block compressor class used by the region services.
 
         Raises:
             exceptions.TransportError: Failed to connect.
@@ -162,9 +257,11 @@ class RegionManager(object):
 
         """
         self._lock = threading.Semaphore(1)
-        self._tree = rbtree.RBTree()
+        self._indexes = dict()  # table name => RegionIndex
         self._meta_service = services.MetaService(zkquorum, zkpath)
         self._region_services = dict()
+        self._codec = codec
+        self._compressor = compressor
 
     def close(self):
         if not self._region_services:
@@ -178,7 +275,7 @@ class RegionManager(object):
 
         Args:
             table (str): Table name.
-            key (str): Row key.
+            key (bytes): Row key.
             use_cache (bool): If set to True, the manager will always try to search the cache first.
                 If set to False, it never uses the cache and always query the meta region server.
 
@@ -192,83 +289,183 @@ class RegionManager(object):
 
         """
         with self._lock:
-            meta_key = self._make_meta_key(table, key)
+            index = self._get_index(table)
             if use_cache:
-                node = self._tree.find(meta_key[:-2])
-                if node is None:
-                    region = self._region_lookup(meta_key)
-                    if region is None:
-                        raise exceptions.RequestError(
-                            'Failed to get region.'
-                        )
-                    self._add_to_cache(region)
+                region = index.find(key)
+                if region is not None:
                     return region
-                else:
-                    return node.value
             else:
-                self._remove_from_cache(meta_key[:-2])
-                region = self._region_lookup(meta_key)
-                if region is None:
-                    raise exceptions.RequestError(
-                        'Failed to get region.'
-                    )
-                self._add_to_cache(region)
-                return region
-
-    @staticmethod
-    def _make_meta_key(table, key):
-        buffer = io.StringIO()
-        buffer.write(table)
-        buffer.write(',')
-        buffer.write(key)
-        buffer.write(',:')
-        return buffer.getvalue()
-
-    def _add_to_cache(self, region):
-        """
+                index.remove(key)
+            region = self._region_lookup(self._make_meta_key(table, key))
+            if region is None:
+                raise exceptions.RequestError(
+                    'Failed to get region.'
+                )
+            index.add(region)
+            return region
+
+    def get_region_before(self, table, key, use_cache=True):
+        """Get the region just before a row key, which is used by reversed scans.
 
         Args:
-            region (Region):
+            table (str): Table name.
+            key (bytes): Row key. The region returned ends at (or contains) the largest keys less than it.
+                b'' means the end of the table, and the last region of the table is returned.
+            use_cache (bool): Search the cache first.
 
-        """
-        self._remove_from_cache(region)
-        self._tree.insert(region)
+        Returns:
+            Region: The region matches.
+            None: There is no region before the key.
+
+        Raises:
+            exceptions.TransportError: Failed to connect.
+            exceptions.ProtocolError: Invalid response.
 
-    def _remove_from_cache(self, region_or_meta_key):
         """
+        with self._lock:
+            index = self._get_index(table)
+            if use_cache:
+                region = index.find_before(key)
+                if region is not None:
+                    return region
+            table_prefix = table.encode()
+            if key == b'':
+                # '-' is the byte right after ',', so the closest row before it is the last region
+                meta_key = table_prefix + b'-'
+            else:
+                # without the ':' suffix, the region starts with the key is excluded
+                meta_key = table_prefix + b',' + key + b','
+            region = self._region_lookup(meta_key)
+            if region is None or not region.name.startswith(table_prefix + b','):
+                return None
+            index.add(region)
+            return region
+
+    def prefetch(self, table, batch_size=1000):
+        """Load all the regions of a table into the cache with one meta scan.
+
+        The meta rows of the table are read in batches of small scans, instead of one Get per region.
+        Split parents and the regions which are not assigned to any server are skipped,
+        so that they are located one by one when they are used.
 
         Args:
-            region_or_meta_key (Region|str):
+            table (str): Table name.
+            batch_size (int): Number of meta rows returned by each request.
+
+        Returns:
+            list[Region]: The regions in key order.
+
+        Raises:
+            exceptions.TransportError: Failed to connect.
+            exceptions.ProtocolError: Invalid response.
 
         """
-        while self._tree.delete(region_or_meta_key) is not None:
-            pass
+        table_prefix = table.encode()
+        start_row = table_prefix + b','
+        # '-' is the byte right after ',', so the meta rows of the table are all in [table + ',', table + '-')
+        stop_row = table_prefix + b'-'
+        regions = list()
+        while True:
+            column = protobuf.Column()
+            column.family = b'info'
+            req = protobuf.ScanRequest()
+            req.region.type = 1
+            req.region.value = b'hbase:meta,,1'
+            req.scan.start_row = start_row
+            req.scan.stop_row = stop_row
+            req.scan.column.extend([column])
+            req.scan.small = True
+            req.number_of_rows = batch_size
+            req.close_scanner = True
+
+            resp = self._meta_request(req)
+            results = [result for result in resp.results if len(result.cell) > 0]
+            for result in results:
+                region_name, region_info, server_info = self._parse_meta_row(result.cell)
+                if region_info is None or server_info is None:
+                    continue
+                if region_info.offline or region_info.split:
+                    continue
+                regions.append(self._make_region(region_name, region_info, server_info))
+
+            if resp.HasField('more_results_in_region'):
+                more_results = resp.more_results_in_region
+            else:
+                more_results = len(results) >= batch_size
+            if not more_results or len(results) == 0:
+                break
+            # the smallest row after the last one
+            start_row = results[-1].cell[0].row + b'\x00'
+
+        regions.sort(key=lambda region: region.start_key)
+        with self._lock:
+            self._get_index(table).add_all(regions)
+        return regions
+
+    @staticmethod
+    def _make_meta_key(table, key):
+        # ':' is larger than the digits of the region ids, so the closest row before it is the region of the key
+        return table.encode() + b',' + key + b',:'
+
+    def _get_index(self, table):
+        try:
+            return self._indexes[table]
+        except KeyError:
+            index = self._indexes[table] = RegionIndex()
+            return index
 
     def _region_lookup(self, meta_key):
         column = protobuf.Column()
         column.family = b'info'
         req = protobuf.GetRequest()
-        req.get.row = meta_key.encode()
+        req.get.row = meta_key
         req.get.column.extend([column])
         req.get.closest_row_before = True
         req.region.type = 1
         req.region.value = b'hbase:meta,,1'
 
+        resp = self._meta_request(req)
+        cells = resp.result.cell
+        if len(cells) == 0:
+            return None
+
+        region_name, region_info, server_info = self._parse_meta_row(cells)
+        if server_info is None:
+            raise exceptions.ProtocolError(
+                'Server host information not found.'
+            )
+        if region_info is None:
+            raise exceptions.ProtocolError(
+                'Region information not found.'
+            )
+        return self._make_region(region_name, region_info, server_info)
+
+    def _meta_request(self, req):
         try:
-            resp = self._meta_service.request(req)
+            return self._meta_service.request(req)
         except exceptions.RegionError:
             while True:
                 time.sleep(3)
                 try:
-                    resp = self._meta_service.request(req)
-                    break
+                    return self._meta_service.request(req)
                 except exceptions.RegionError:
                     continue
-        cells = resp.result.cell
-        if len(cells) == 0:
-            return None
 
-        region_name = cells[0].row.decode()
+    @staticmethod
+    def _parse_meta_row(cells):
+        """Parse the info columns of a meta row.
+
+        Args:
+            cells (list[protobuf.Cell]): Cells of the row.
+
+        Returns:
+            tuple: (region name, protobuf.RegionInfo|None, server info str|None)
+
+        Raises:
+            exceptions.ProtocolError: Invalid region information.
+
+        """
+        region_name = cells[0].row
         server_info = None
         region_info = None
         for cell in cells:
@@ -284,22 +481,14 @@ class RegionManager(object):
                     )
                 region_info = protobuf.RegionInfo()
                 region_info.ParseFromString(region_info_bytes[4:-4])
+        return region_name, region_info, server_info
 
-        if server_info is None:
-            raise exceptions.ProtocolError(
-                'Server host information not found.'
-            )
-        if region_info is None:
-            raise exceptions.ProtocolError(
-                'Region information not found.'
-            )
-
+    @staticmethod
+    def _make_region(region_name, region_info, server_info):
         host, port = server_info.split(':')
         port = int(port)
         table = region_info.table_name.namespace.decode() + ':' + region_info.table_name.qualifier.decode()
-        start_key = region_info.start_key.decode()
-        end_key = region_info.end_key.decode()
-        return Region(region_name, table, start_key, end_key, host, port)
+        return Region(region_name, table, region_info.start_key, region_info.end_key, host, port)
 
     def get_service(self, region):
         """Get a region service given a region.
@@ -319,6 +508,11 @@ class RegionManager(object):
             try:
                 service = self._region_services[(host, port)]
             except KeyError:
-                service = services.RegionService(host, port)
+                service = services.RegionService(host, port, self._codec, self._compressor)
                 self._region_services[(host, port)] = service
             return service
+
+
+def _to_str(key):
+    # only for display, the keys may not be valid UTF-8
+    return key.decode(errors='backslashreplace')
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+
+"""
+@author: xi
+@since: 2026-10-16
+"""
+
+
+class ColumnBatch(object):
+
+    def __init__(self, keys, values, nulls):
+        """A batch of rows in column order.
+
+        Args:
+            keys (numpy.ndarray): Row keys, str or bytes.
+            values (dict[str, numpy.ndarray]): Column name => values of the rows.
+                A null value is zero for the typed columns and None for the bytes columns.
+            nulls (dict[str, numpy.ndarray]): Column name => bool array, True if the row does not have the column.
+
+        """
+        self._keys = keys
+        self._values = values
+        self._nulls = nulls
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __getitem__(self, column):
+        return self._values[column]
+
+    def __repr__(self):
+        return 'ColumnBatch: %d rows, columns %s' % (len(self._keys), str(list(self._values)))
+
+    @property
+    def keys(self):
+        return self._keys
+
+    @property
+    def values(self):
+        return self._values
+
+    @property
+    def nulls(self):
+        return self._nulls
+
+
+class CellRow(object):
+    __slots__ = ('key', 'cells')
+
+    def __init__(self, key, cells):
+        """A row which keeps its cells as they are decoded from the response.
+
+        Args:
+            key (bytes): Row key.
+            cells (list[services.codec.Cell]): Cells of the row.
+
+        """
+        self.key = key
+        self.cells = cells
+
+    def update(self, other):
+        self.cells.extend(other.cells)
+
+
+def make_cell_row(cells):
+    """Row factory of the scanners, which keeps the cells of a row without building a dict.
+
+    Args:
+        cells (list[services.codec.Cell]): Cells of the row.
+
+    Returns:
+        CellRow: The row.
+        None: There is no cell.
+
+    """
+    if len(cells) < 1:
+        return None
+    return CellRow(cells[0].row, list(cells))
+
+
+def make_batch(rows, columns, dtypes=None, binary_keys=False):
+    """Convert rows to a column batch.
+
+    The values of a typed column are joined into one buffer and decoded by numpy at once,
+    so every value should have exactly the size of the dtype, e.g., 8 bytes for '>i8'.
+
+    Args:
+        rows (list[CellRow]): Rows.
+        columns (list[str]|tuple[str]): Columns in the batch, e.g., ['cf:a', 'cf:b'].
+        dtypes (dict[str, T]): Column name => numpy dtype of its values.
+            The columns without dtype are object arrays of bytes.
+        binary_keys (bool): Keep the row keys in bytes instead of decoding them with UTF-8.
+
+    Returns:
+        ColumnBatch: The batch.
+
+    Raises:
+        ImportError: numpy is not installed.
+        ValueError: A value does not have the size of its dtype.
+
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError('numpy is required by the column batches.')
+
+    index = dict()
+    for i, column in enumerate(columns):
+        if isinstance(column, str):
+            column = column.encode()
+        family, _, qualifier = column.partition(b':')
+        index[(family, qualifier)] = i
+    num_rows = len(rows)
+    column_values = [[None] * num_rows for _ in columns]
+    keys = numpy.empty(num_rows, dtype=object)
+    for i, row in enumerate(rows):
+        keys[i] = row.key if binary_keys else row.key.decode()
+        for cell in row.cells:
+            j = index.get((cell.family, cell.qualifier))
+            if j is not None:
+                column_values[j][i] = cell.value
+
+    values = dict()
+    nulls = dict()
+    for column, column_value in zip(columns, column_values):
+        null = numpy.fromiter((value is None for value in column_value), dtype=bool, count=num_rows)
+        dtype = dtypes.get(column) if dtypes is not None else None
+        if dtype is None:
+            array = numpy.empty(num_rows, dtype=object)
+            array[:] = column_value
+        else:
+            dtype = numpy.dtype(dtype)
+            item_size = dtype.itemsize
+            zero = b'\x00' * item_size
+            data = bytearray().join(value if value is not None else zero for value in column_value)
+            if len(data) != item_size * num_rows:
+                for i, value in enumerate(column_value):
+                    if value is not None and len(value) != item_size:
+                        raise ValueError(
+                            'Value of %s in row %s has %d bytes, but %s needs %d bytes.' %
+                            (column, keys[i], len(value), str(dtype), item_size)
+                        )
+            array = numpy.frombuffer(data, dtype=dtype)
+        values[column] = array
+        nulls[column] = null
+    return ColumnBatch(keys, values, nulls)
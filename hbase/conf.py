@@ -6,9 +6,6 @@
 """
 import os
 
-num_threads_per_conn = 5
-num_tasks_per_conn = 100
-
 
 # Modify This Configuration on use zk path
 class Conf:
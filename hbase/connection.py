@@ -6,78 +6,129 @@
 """
 
 import collections
-import queue
 import threading
+from concurrent import futures
 
 from . import client
-from . import conf
 from .exceptions import *
 from .namespace import Namespace
 
 
-class Threads(object):
+class Executor(object):
 
     def __init__(self, num_threads, max_tasks):
-        self._num_threads = num_threads
+        """Task executor of a connection.
 
-        self._done_lock = threading.Semaphore(0)
-        self._ready_lock = threading.Semaphore(0)
-        self._queue = queue.Queue(max_tasks)
-        self._threads = [
-            threading.Thread(target=self._target)
-            for _ in range(num_threads)
-        ]
-        for thread in self._threads:
-            thread.setDaemon(True)
-            thread.start()
-
-    def _target(self):
-        while True:
-            task = self._queue.get(block=True)
-            if task is None:
-                break
-            fn, args, callback = task
-            ret = fn(*args)
-            if callback is not None:
-                callback(ret)
+        Tasks run in a thread pool and each of them gets a Future. A failed task does not affect the
+        workers, its error is set to the Future, and is also kept until the next flush().
+
+        Args:
+            num_threads (int): Number of worker threads.
+            max_tasks (int): Max number of pending tasks. submit() blocks when it is reached.
+
+        """
+        if num_threads <= 0:
+            raise ValueError('num_threads should be positive value.')
+        if max_tasks <= 0:
+            raise ValueError('max_tasks should be positive value.')
+        self._executor = futures.ThreadPoolExecutor(num_threads)
+        self._slots = threading.Semaphore(max_tasks)
+
+        self._lock = threading.Semaphore(1)
+        self._pending = set()
+        self._errors = list()
+
+    def submit(self, fn, args=None, callback=None):
+        """Submit a task.
+
+        Args:
+            fn (callable): The task function.
+            args (tuple|None): Arguments of the function.
+            callback (callable|None): Callback with the return value when the task succeeds.
+
+        Returns:
+            futures.Future: The future of the task.
 
-    def put_task(self, fn, args, callback=None):
+        """
         assert fn is not None
         if args is None:
             args = ()
-        self._queue.put((fn, args, callback), block=True)
-
-    def wait_all(self):
-        for _ in range(self._num_threads):
-            task = (
-                lambda: self._done_lock.release(),
-                (),
-                lambda _: self._ready_lock.acquire()
-            )
-            self._queue.put(task, block=True)
-        for _ in range(self._num_threads):
-            self._done_lock.acquire()
-        for _ in range(self._num_threads):
-            self._ready_lock.release()
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(lambda f: self._on_done(f, args, callback))
+        return future
+
+    def _on_done(self, future, args, callback):
+        error = None
+        try:
+            # a cancelled task is not an error, and it has no result for the callback
+            if not future.cancelled():
+                error = future.exception()
+                if error is None and callback is not None:
+                    try:
+                        callback(future.result())
+                    except Exception as e:
+                        error = e
+        finally:
+            with self._lock:
+                self._pending.discard(future)
+                if error is not None:
+                    self._errors.append((args, error))
+            self._slots.release()
+
+    def flush(self):
+        """Wait for all the submitted tasks to complete.
 
-    def terminate(self):
-        for _ in range(self._num_threads):
-            self._queue.put(None, block=True)
-        for thread in self._threads:
-            thread.join()
+        Raises:
+            BatchError: Some tasks failed since the last flush. The errors are (args, error) pairs.
+
+        """
+        while True:
+            with self._lock:
+                pending = list(self._pending)
+            if not pending:
+                break
+            futures.wait(pending)
+        with self._lock:
+            errors = self._errors
+            self._errors = list()
+        if errors:
+            raise BatchError('%d tasks failed.' % len(errors), errors)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
 
 
 class Connection(object):
 
-    def __init__(self, on_close, zkquorum):
+    def __init__(self,
+                 on_close,
+                 zkquorum,
+                 compression=None,
+                 num_threads=5,
+                 max_tasks=100,
+                 binary_keys=False,
+                 cell_block=False):
         """Connection.
 
         Args:
             on_close: Callback when connection close.
             zkquorum (str): Zookeeper quorum. Comma-separated list of hosts to connect to.
                 e.g., '127.0.0.1:2181,127.0.0.1:2182,[::1]:2183'
+            compression (str|None): Cell block compression, one of {'deflate', 'zlib', 'gzip'}. It requires cell_block.
+            num_threads (int): Number of threads running the asynchronous operations, e.g., Table.put().
+            max_tasks (int): Max number of pending asynchronous operations.
+            binary_keys (bool): Return the rows with bytes row keys and column names.
+            cell_block (bool): Receive the cells of Get/Scan/Multi responses in cell blocks.
 
         Raises:
+            ValueError: Unsupported compression, or compression without cell block.
             TransportError
             ZookeeperProtocolError
             NoSuchZookeeperNodeError
@@ -86,10 +137,15 @@ class Connection(object):
         self._on_close = on_close
         self._zkquorum = zkquorum
 
-        self._client = client.Client(zkquorum)
+        self._client = client.Client(
+            zkquorum,
+            cell_block=cell_block,
+            compression=compression,
+            binary_keys=binary_keys
+        )
         self._namespaces = dict()
 
-        self._threads = Threads(conf.num_threads_per_conn, conf.num_tasks_per_conn)
+        self._executor = Executor(num_threads, max_tasks)
 
     @property
     def zkquorum(self):
@@ -106,12 +162,36 @@ class Connection(object):
         return self._client
 
     @property
-    def threads(self):
-        return self._threads
+    def executor(self):
+        """Executor of the asynchronous operations.
+
+        Returns:
+            Executor: Executor object.
+
+        """
+        return self._executor
+
+    def flush(self):
+        """Wait for all the asynchronous operations to complete.
+
+        Raises:
+            BatchError: Some operations failed since the last flush.
+                The errors are (args, error) pairs, where args are the arguments of the operation.
+
+        """
+        self._executor.flush()
 
     def close(self):
-        self._threads.wait_all()
-        self._on_close(self)
+        """Wait for the asynchronous operations, and give the connection back.
+
+        Raises:
+            BatchError: Some operations failed since the last flush.
+
+        """
+        try:
+            self._executor.flush()
+        finally:
+            self._on_close(self)
 
     def __enter__(self):
         return self
@@ -232,17 +312,35 @@ class Connection(object):
 
 class ConnectionPool(object):
 
-    def __init__(self, zkquorum, max_size=10):
+    def __init__(self,
+                 zkquorum,
+                 max_size=10,
+                 compression=None,
+                 num_threads=5,
+                 max_tasks=100,
+                 binary_keys=False,
+                 cell_block=False):
         """Connection pool.
 
         Args:
             zkquorum (str): Zookeeper quorum. Comma-separated list of hosts to connect to.
                 e.g., '127.0.0.1:2181,127.0.0.1:2182,[::1]:2183'
             max_size (int): Max pool size.
+            compression (str|None): Cell block compression used by the connections.
+                It can be one of {'deflate', 'zlib', 'gzip'}. None means no compression. It requires cell_block.
+            num_threads (int): Number of threads per connection running the asynchronous operations.
+            max_tasks (int): Max number of pending asynchronous operations per connection.
+            binary_keys (bool): Return the rows with bytes row keys and column names.
+            cell_block (bool): Receive the cells of Get/Scan/Multi responses in cell blocks.
 
         """
         self._zkquorum = zkquorum
         self._max_size = max_size
+        self._compression = compression
+        self._num_threads = num_threads
+        self._max_tasks = max_tasks
+        self._binary_keys = binary_keys
+        self._cell_block = cell_block
         self._conns = collections.deque()
 
     def connect(self):
@@ -253,9 +351,17 @@ class ConnectionPool(object):
 
         """
         if len(self._conns) > 0:
-            return self._conns.pop(0)
+            return self._conns.popleft()
         else:
-            return Connection(self._on_conn_close, self._zkquorum)
+            return Connection(
+                self._on_conn_close,
+                self._zkquorum,
+                self._compression,
+                self._num_threads,
+                self._max_tasks,
+                self._binary_keys,
+                self._cell_block
+            )
 
     def _on_conn_close(self, conn):
         """Callback when connection close.
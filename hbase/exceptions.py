@@ -26,6 +26,18 @@ class RequestError(IOError):
     pass
 
 
+class BatchError(RequestError):
+    """Some operations of a batch failed.
+
+    Attributes:
+        errors (list[tuple]): (operation, error) for each failed operation.
+    """
+
+    def __init__(self, message, errors):
+        super(BatchError, self).__init__(message)
+        self.errors = errors
+
+
 class NoSuchZookeeperNodeError(RequestError):
     pass
 
@@ -54,6 +66,42 @@ class RegionTooBusyError(RegionError):
     pass
 
 
+class ScannerError(RequestError):
+    """The region scanner can not be used any more, and the scan should be reopened.
+
+    This error can be caused by:
+        org.apache.hadoop.hbase.exceptions.ScannerResetException
+    """
+    pass
+
+
+class UnknownScannerError(ScannerError):
+    """The region scanner doesn't exist, e.g., its lease has expired.
+
+    This error can be caused by:
+        org.apache.hadoop.hbase.UnknownScannerException
+    """
+    pass
+
+
+class OutOfOrderScannerNextError(ScannerError):
+    """The sequence number of the scanner call doesn't match the server's, e.g., a call has been retried.
+
+    This error can be caused by:
+        org.apache.hadoop.hbase.exceptions.OutOfOrderScannerNextException
+    """
+    pass
+
+
+class UnknownServiceError(RequestError):
+    """The coprocessor service is not loaded on the region.
+
+    This error can be caused by:
+        org.apache.hadoop.hbase.exceptions.UnknownProtocolException
+    """
+    pass
+
+
 class ServerIOError(RequestError):
     """Server side IO error.
 
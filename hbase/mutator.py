@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+
+"""
+@author: xi
+@since: 2026-10-16
+"""
+
+import atexit
+import threading
+import time
+
+from . import client
+from .exceptions import *
+
+
+class Mutator(object):
+
+    def __init__(self,
+                 table,
+                 max_bytes,
+                 max_rows,
+                 flush_interval,
+                 max_in_flight=4):
+        """Buffered mutator.
+
+        Puts and deletes are buffered per region server, and sent with Multi requests by a background thread
+        when a region server has max_rows mutations, when max_bytes are buffered, or every flush_interval seconds.
+        When max_bytes are buffered or being sent, put() and delete() block until the data is sent.
+
+        Failed mutations are raised as a BatchError by flush() or close().
+
+        The mutator must be closed, explicitly or by the with statement. The flush thread holds it,
+        so it is never garbage collected while it is open. A mutator left open is closed at interpreter exit,
+        where its errors can only be printed.
+
+        Args:
+            table (hbase.table.Table): Table object.
+            max_bytes (int): Max number of bytes buffered.
+            max_rows (int): Max number of mutations buffered for one region server.
+            flush_interval (float|None): Max seconds a mutation stays in the buffer.
+                None means no time based flush.
+            max_in_flight (int): Max number of Multi requests in flight to each region server.
+
+        """
+        if max_bytes <= 0:
+            raise ValueError('max_bytes should be positive value.')
+        if max_rows <= 0:
+            raise ValueError('max_rows should be positive value.')
+        self._table = table
+        self._max_bytes = max_bytes
+        self._max_rows = max_rows
+        self._flush_interval = flush_interval
+        self._max_in_flight = max_in_flight
+
+        self._client = table.client
+        self._full_name = table.full_name
+        # every put and delete is routed by its region, so locate all the regions once for the table
+        self._client.prefetch_regions(self._full_name)
+
+        self._cond = threading.Condition()
+        self._buffers = dict()  # server address => list of (mutate_type, row)
+        self._ready = set()  # server addresses to flush
+        self._flush_all = False
+        self._buffered_bytes = 0
+        self._flushing_bytes = 0
+        self._errors = list()
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._flush_loop, name='hbase-mutator-%s' % self._full_name)
+        self._thread.daemon = True
+        self._thread.start()
+        atexit.register(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def put(self, row):
+        """Put a row.
+
+        Args:
+            row (hbase.client.Row): Row object.
+
+        Raises:
+            RuntimeError: The mutator has been closed.
+
+            TransportError
+            ZookeeperProtocolError
+            ServiceProtocolError
+            NoSuchZookeeperNodeError
+
+        """
+        size = len(row.key) + sum(len(column) + len(value) for column, value in row.items())
+        self._add(client.MUTATE_PUT, row, size)
+
+    def delete(self, key):
+        """Delete a row by key.
+
+        Args:
+            key (str|bytes): Row key.
+
+        Raises:
+            RuntimeError: The mutator has been closed.
+
+            TransportError
+            ZookeeperProtocolError
+            ServiceProtocolError
+            NoSuchZookeeperNodeError
+
+        """
+        self._add(client.MUTATE_DELETE, client.Row(key), len(key))
+
+    def _add(self, mutate_type, row, size):
+        region = self._client.locate(self._full_name, row.key)
+        server = (region.host, region.port)
+        with self._cond:
+            # backpressure: wait until the buffered and in flight data is sent
+            while not self._closed and self._buffered_bytes + self._flushing_bytes >= self._max_bytes:
+                self._flush_all = True
+                self._cond.notify_all()
+                self._cond.wait()
+            if self._closed:
+                raise RuntimeError('Failed to write. The mutator has been closed.')
+            if not self._buffers:
+                # start the timer of the flush thread
+                self._cond.notify_all()
+            try:
+                buffer = self._buffers[server]
+            except KeyError:
+                buffer = self._buffers[server] = list()
+            buffer.append((mutate_type, row, size))
+            self._buffered_bytes += size
+            if len(buffer) >= self._max_rows:
+                self._ready.add(server)
+                self._cond.notify_all()
+            elif self._buffered_bytes >= self._max_bytes:
+                self._flush_all = True
+                self._cond.notify_all()
+
+    def _flush_loop(self):
+        deadline = None
+        while True:
+            with self._cond:
+                while not (self._flush_all or self._ready or self._closed):
+                    if self._flush_interval is None or not self._buffers:
+                        deadline = None
+                        self._cond.wait()
+                        continue
+                    now = time.time()
+                    if deadline is None:
+                        deadline = now + self._flush_interval
+                    if now >= deadline:
+                        self._flush_all = True
+                        break
+                    self._cond.wait(deadline - now)
+                if self._flush_all or self._closed:
+                    servers = list(self._buffers)
+                    deadline = None
+                else:
+                    servers = list(self._ready)
+                self._flush_all = False
+                self._ready.clear()
+                mutations = list()
+                for server in servers:
+                    mutations.extend(self._buffers.pop(server, ()))
+                size = sum(item[2] for item in mutations)
+                self._buffered_bytes -= size
+                self._flushing_bytes += size
+                if not mutations and self._closed:
+                    self._cond.notify_all()
+                    return
+
+            errors = self._send(mutations)
+
+            with self._cond:
+                self._flushing_bytes -= size
+                self._errors.extend(errors)
+                self._cond.notify_all()
+
+    def _send(self, mutations):
+        if not mutations:
+            return []
+        try:
+            results = self._client.mutate_many(
+                self._full_name,
+                [(mutate_type, row) for mutate_type, row, _ in mutations],
+                batch_size=self._max_rows,
+                max_in_flight=self._max_in_flight
+            )
+        except Exception as e:
+            # the error must reach flush() instead of killing the flush thread
+            return [(row, e) for _, row, _ in mutations]
+        return [
+            (row, result)
+            for (_, row, _), result in zip(mutations, results)
+            if result is not True
+        ]
+
+    def flush(self):
+        """Send all the buffered mutations and wait for them to complete.
+
+        Raises:
+            BatchError: Some mutations failed. The errors are (row, error) pairs.
+
+        """
+        with self._cond:
+            while self._buffered_bytes + self._flushing_bytes > 0 or self._buffers:
+                if self._closed and not self._thread.is_alive():
+                    break
+                self._flush_all = True
+                self._cond.notify_all()
+                self._cond.wait()
+            errors = self._errors
+            self._errors = list()
+        if errors:
+            raise BatchError('%d mutations failed.' % len(errors), errors)
+
+    def close(self):
+        """Flush and stop the mutator.
+
+        Raises:
+            BatchError: Some mutations failed. The errors are (row, error) pairs.
+
+        """
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        atexit.unregister(self.close)
+        self._thread.join()
+        with self._cond:
+            errors = self._errors
+            self._errors = list()
+        if errors:
+            raise BatchError('%d mutations failed.' % len(errors), errors)
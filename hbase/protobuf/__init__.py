@@ -424,7 +424,7 @@ REQUEST_TYPES = {
     MutateRequest: 'Mutate',
     ScanRequest: 'Scan',
     BulkLoadHFileRequest: 'BulkLoadHFile',
-    CoprocessorServiceRequest: 'CoprocessorService',
+    CoprocessorServiceRequest: 'ExecService',
     MultiRequest: 'Multi',
     AddColumnRequest: 'AddColumn',
     DeleteColumnRequest: 'DeleteColumn',
@@ -523,7 +523,7 @@ RESPONSE_TYPES = {
     'Mutate': MutateResponse,
     'Scan': ScanResponse,
     'BulkLoadHFile': BulkLoadHFileResponse,
-    'CoprocessorService': CoprocessorServiceResponse,
+    'ExecService': CoprocessorServiceResponse,
     'Multi': MultiResponse,
     'AddColumn': AddColumnResponse,
     'DeleteColumn': DeleteColumnResponse,
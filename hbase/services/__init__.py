@@ -8,3 +8,5 @@
 from hbase.services.services import MasterService
 from hbase.services.services import MetaService
 from hbase.services.services import RegionService
+from hbase.services import codec
+from hbase.services.request import make_error
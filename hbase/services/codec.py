@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+
+"""
+@author: xi
+@since: 2026-10-16
+"""
+
+import collections
+import gzip
+import struct
+import zlib
+
+from hbase import exceptions
+
+KEY_VALUE_CODEC = 'org.apache.hadoop.hbase.codec.KeyValueCodec'
+
+#
+# Compressors which can be handled by the standard library.
+# DefaultCodec produces zlib streams and GzipCodec produces gzip streams.
+COMPRESSORS = {
+    'deflate': 'org.apache.hadoop.io.compress.DefaultCodec',
+    'zlib': 'org.apache.hadoop.io.compress.DefaultCodec',
+    'gzip': 'org.apache.hadoop.io.compress.GzipCodec'
+}
+
+#
+# KeyValue types and timestamp
+LATEST_TIMESTAMP = 0x7fffffffffffffff
+TYPE_PUT = 4
+TYPE_DELETE = 8
+TYPE_DELETE_COLUMN = 12
+TYPE_DELETE_FAMILY = 14
+
+Cell = collections.namedtuple('Cell', ('row', 'family', 'qualifier', 'timestamp', 'cell_type', 'value'))
+
+_kv_head = struct.Struct('>IIIH')
+_kv_family = struct.Struct('>B')
+_kv_tail = struct.Struct('>QB')
+
+
+def decode_cells(data):
+    """Decode a KeyValueCodec cell block.
+
+    The cell block is a sequence of length prefixed KeyValues:
+        (4B total_length)(4B key_length)(4B value_length)(key)(value)
+    and the key of a KeyValue is:
+        (2B row_length)(row)(1B family_length)(family)(qualifier)(8B timestamp)(1B type)
+
+    Args:
+        data (bytes|bytearray|memoryview): The cell block.
+
+    Returns:
+        list[Cell]: Cells in the order they appear in the block.
+
+    Raises:
+        exceptions.ServiceProtocolError: The cell block is truncated or corrupted.
+
+    """
+    # one copy out of the receive buffer, all the fields are sliced from it
+    data = bytes(data)
+    cells = list()
+    append = cells.append
+    unpack_head = _kv_head.unpack_from
+    unpack_tail = _kv_tail.unpack_from
+    end = len(data)
+    pos = 0
+    try:
+        while pos < end:
+            total_size, key_size, value_size, row_size = unpack_head(data, pos)
+            key_start = pos + 12
+            key_end = key_start + key_size
+            value_end = key_end + value_size
+            if value_end > end:
+                raise exceptions.ServiceProtocolError('Truncated cell block.')
+            family_start = key_start + 2 + row_size
+            family_end = family_start + 1 + data[family_start]
+            timestamp, cell_type = unpack_tail(data, key_end - 9)
+            append(Cell(
+                data[key_start + 2:family_start],
+                data[family_start + 1:family_end],
+                data[family_end:key_end - 9],
+                timestamp,
+                cell_type,
+                data[key_end:value_end]
+            ))
+            pos += 4 + total_size
+    except (struct.error, IndexError):
+        raise exceptions.ServiceProtocolError('Corrupted cell block.')
+    return cells
+
+
+def encode_cell(buffer,
+                row,
+                family,
+                qualifier,
+                value,
+                timestamp=LATEST_TIMESTAMP,
+                cell_type=TYPE_PUT):
+    """Append a KeyValue to a cell block.
+
+    The layout is the same as the one read by decode_cells().
+    LATEST_TIMESTAMP tells the server to use its current time.
+
+    Args:
+        buffer (bytearray): The cell block to append to.
+        row (bytes): Row key.
+        family (bytes): Column family.
+        qualifier (bytes): Column qualifier.
+        value (bytes): Cell value.
+        timestamp (int): Cell timestamp.
+        cell_type (int): KeyValue type, e.g., TYPE_PUT.
+
+    """
+    key_size = len(row) + len(family) + len(qualifier) + 12
+    value_size = len(value)
+    buffer += _kv_head.pack(key_size + value_size + 8, key_size, value_size, len(row))
+    buffer += row
+    buffer += _kv_family.pack(len(family))
+    buffer += family
+    buffer += qualifier
+    buffer += _kv_tail.pack(timestamp, cell_type)
+    buffer += value
+
+
+def get_compressor(compression):
+    """Get the compressor class name of a compression method.
+
+    Args:
+        compression (str|None): One of {'deflate', 'zlib', 'gzip'}, or None for no compression.
+
+    Returns:
+        str: Compressor class name.
+        None: No compression.
+
+    Raises:
+        ValueError: Unsupported compression.
+
+    """
+    if compression is None:
+        return None
+    try:
+        return COMPRESSORS[compression.lower()]
+    except KeyError:
+        raise ValueError(
+            'Unsupported compression %s. It should be one of %s.' % (compression, str(sorted(COMPRESSORS)))
+        )
+
+
+def compress(data, compressor):
+    """Compress a cell block.
+
+    Args:
+        data (bytes): The cell block.
+        compressor (str): Compressor class name.
+
+    Returns:
+        bytes: Compressed cell block.
+
+    """
+    if compressor == COMPRESSORS['gzip']:
+        return gzip.compress(data)
+    return zlib.compress(data)
+
+
+def decompress(data):
+    """Decompress a cell block.
+
+    Both zlib and gzip streams are accepted, and so are several concatenated streams.
+
+    Args:
+        data (bytes|bytearray|memoryview): Compressed cell block.
+
+    Returns:
+        bytes: The cell block.
+
+    Raises:
+        exceptions.ServiceProtocolError: Invalid compressed data.
+
+    """
+    chunks = list()
+    try:
+        while data:
+            # 32 + MAX_WBITS: detect zlib or gzip header automatically
+            decompressor = zlib.decompressobj(32 + zlib.MAX_WBITS)
+            chunks.append(decompressor.decompress(data))
+            if not decompressor.eof:
+                raise exceptions.ServiceProtocolError('Truncated compressed cell block.')
+            data = decompressor.unused_data
+    except zlib.error:
+        raise exceptions.ServiceProtocolError('Failed to decompress cell block.')
+    return b''.join(chunks)
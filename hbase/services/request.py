@@ -5,15 +5,20 @@
 @since: 2018-05-13
 """
 
-import io
+import concurrent.futures
 import socket
 import struct
-import sys
 import threading
 
+from google.protobuf.message import DecodeError
+
 from hbase import exceptions
 from hbase import protobuf as pb
 from hbase.conf import Conf
+from hbase.services import codec
+
+INIT_BUFFER_SIZE = 65536
+MAX_KEPT_BUFFER_SIZE = 16777216
 
 
 def encode_varint(value):
@@ -45,16 +50,81 @@ def decode_varint(buffer, pos, mask=(1 << 64) - 1):
             raise exceptions.ServiceProtocolError('Too many bytes when decoding varint.')
 
 
+_header_suffix_dict = dict()  # method_name => serialized RequestHeader without call_id
+
+
+def _header_suffix(method_name):
+    """Get the serialized request header fields shared by all the calls of a method.
+
+    Args:
+        method_name (str): RPC method name.
+
+    Returns:
+        bytes: Serialized RequestHeader with method_name and request_param set.
+
+    """
+    try:
+        return _header_suffix_dict[method_name]
+    except KeyError:
+        pb_header = pb.RequestHeader()
+        pb_header.method_name = method_name
+        pb_header.request_param = True
+        suffix = pb_header.SerializeToString()
+        _header_suffix_dict[method_name] = suffix
+        return suffix
+
+
+def make_error(error):
+    """Convert the exception class name returned by the server to an exception object.
+
+    Args:
+        error (str): Java exception class name.
+
+    Returns:
+        exceptions.RequestError: The exception object.
+
+    """
+    if error == 'org.apache.hadoop.hbase.exceptions.RegionMovedException':
+        return exceptions.RegionMovedError(error)
+    elif error == 'org.apache.hadoop.hbase.NotServingRegionException':
+        return exceptions.NotServingRegionError()
+    elif error == 'org.apache.hadoop.hbase.regionserver.RegionServerStoppedException':
+        return exceptions.RegionServerStoppedError(error)
+    elif error == 'org.apache.hadoop.hbase.exceptions.RegionOpeningException':
+        return exceptions.RegionOpeningError(error)
+    elif error == 'org.apache.hadoop.hbase.RegionTooBusyException':
+        return exceptions.RegionTooBusyError(error)
+    elif error == 'org.apache.hadoop.hbase.UnknownScannerException':
+        return exceptions.UnknownScannerError(error)
+    elif error == 'org.apache.hadoop.hbase.exceptions.OutOfOrderScannerNextException':
+        return exceptions.OutOfOrderScannerNextError(error)
+    elif error == 'org.apache.hadoop.hbase.exceptions.ScannerResetException':
+        return exceptions.ScannerError(error)
+    elif error == 'org.apache.hadoop.hbase.exceptions.UnknownProtocolException':
+        return exceptions.UnknownServiceError(error)
+    else:
+        return exceptions.RequestError(error)
+
+
 class Request(object):
 
-    def __init__(self, host, port, service_name):
+    def __init__(self, host, port, service_name, codec=None, compressor=None):
         """Request object.
 
+        A request object owns one socket connection to the server.
+        Any number of calls can be in flight on the connection at the same time.
+        A dedicated reader thread receives the responses and dispatches them to the
+        corresponding futures by call_id.
+
         Args:
             host (str): Hostname or IP address.
             port (int): Port number.
             service_name (str): Service name.
                 It can be one of {'MasterService', 'ClientService'}.
+            codec (str|None): Cell block codec class to negotiate with the server, e.g., codec.KEY_VALUE_CODEC.
+                None means the server returns cells as protobuf messages.
+            compressor (str|None): Cell block compressor class to negotiate with the server,
+                e.g., one of codec.COMPRESSORS. None means the cell blocks are not compressed.
 
         Raises:
             exceptions.TransportError: Failed to connect or send messages.
@@ -63,53 +133,30 @@ class Request(object):
         self._host = host
         self._port = port
         self._service_name = service_name
+        self._codec = codec
+        self._compressor = compressor
+
+        self._send_lock = threading.Semaphore(1)
 
         self._call_lock = threading.Semaphore(1)
-        self._call_lock_ = threading.Semaphore(1)
         self._call_id = 0
-        self._lock_dict = dict()  # call_id => semaphore
+        self._future_dict = dict()  # call_id => (method_name, with_cells, future)
+        self._closed = False
 
-        self._resp_lock = threading.Semaphore(1)
-        self._resp_dict = dict()  # call_id => (header, data)
+        # only the reader thread receives, so the buffers can be reused for every frame
+        self._size_buffer = bytearray(4)
+        self._size_view = memoryview(self._size_buffer)
+        self._recv_buffer = bytearray(INIT_BUFFER_SIZE)
 
         self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self._connect()
 
-    def _next_call_id(self):
-        with self._call_lock:
-            call_id = self._call_id
-            self._call_id = (call_id + 1) % sys.maxsize
-        return call_id
-
-    def _wait_call(self, call_id):
-        with self._call_lock:
-            if call_id not in self._lock_dict:
-                self._lock_dict[call_id] = threading.Semaphore(0)
-            lock = self._lock_dict[call_id]
-        lock.acquire()
-        with self._call_lock:
-            del self._lock_dict[call_id]
-
-    def _notify_call(self, call_id):
-        with self._call_lock:
-            if call_id not in self._lock_dict:
-                self._lock_dict[call_id] = threading.Semaphore(0)
-            lock = self._lock_dict[call_id]
-        lock.release()
-
-    def _put_response(self, call_id, header, data, error):
-        with self._resp_lock:
-            if call_id in self._resp_dict:
-                raise exceptions.TransportError('FATAL ERROR: Response for call [%d] exists.' % call_id)
-            self._resp_dict[call_id] = (header, data, error)
-
-    def _get_response(self, call_id):
-        with self._resp_lock:
-            if call_id not in self._resp_dict:
-                raise exceptions.TransportError('FATAL ERROR: Response for call [%d] does not exist.' % call_id)
-            resp = self._resp_dict[call_id]
-            del self._resp_dict[call_id]
-            return resp
+        self._reader = threading.Thread(
+            target=self._read_loop,
+            name='hbase-reader-%s:%d' % (host, port)
+        )
+        self._reader.daemon = True
+        self._reader.start()
 
     def _connect(self):
         """Connect to the server and send "Hello" message.
@@ -133,6 +180,10 @@ class Request(object):
         header = pb.ConnectionHeader()
         header.user_info.effective_user = Conf.EFFECTIVE_USER
         header.service_name = self._service_name
+        if self._codec is not None:
+            header.cell_block_codec_class = self._codec
+            if self._compressor is not None:
+                header.cell_block_compressor_class = self._compressor
         header_bytes = header.SerializeToString()
 
         message = b'HBas\x00\x50' + struct.pack('>I', len(header_bytes)) + header_bytes
@@ -140,11 +191,10 @@ class Request(object):
         self._sock_send(message)
 
     def _sock_send(self, data):
-        target_size = len(data)
-        sent_size = 0
-        while sent_size < target_size:
+        view = memoryview(data)
+        while len(view) > 0:
             try:
-                pack_size = self._sock.send(data[sent_size:])
+                pack_size = self._sock.send(view)
             except socket.error:
                 raise exceptions.TransportError(
                     'Failed to send request to server %s:%d.' % (self._host, self._port)
@@ -153,96 +203,343 @@ class Request(object):
                 raise exceptions.TransportError(
                     'Failed to send request to server %s:%d.' % (self._host, self._port)
                 )
-            sent_size += pack_size
+            view = view[pack_size:]
 
-    def close(self):
-        if self._sock:
-            self._sock.close()
-            self._sock = None
-            # print('DEBUG: connection to %s:%d closed.' % (self._host, self._port))
+    def _sock_send_buffers(self, buffers):
+        """Send a sequence of buffers without concatenating them.
+
+        Args:
+            buffers (list[bytes]): Buffers to send in order.
+
+        Raises:
+            exceptions.TransportError: Failed to send.
 
-    def call(self, pb_req):
-        # send request
-        call_id = self._next_call_id()
+        """
+        if not hasattr(self._sock, 'sendmsg'):
+            for buffer in buffers:
+                self._sock_send(buffer)
+            return
+        views = [memoryview(buffer) for buffer in buffers if len(buffer) > 0]
+        while views:
+            try:
+                pack_size = self._sock.sendmsg(views)
+            except socket.error:
+                raise exceptions.TransportError(
+                    'Failed to send request to server %s:%d.' % (self._host, self._port)
+                )
+            if pack_size == 0:
+                raise exceptions.TransportError(
+                    'Failed to send request to server %s:%d.' % (self._host, self._port)
+                )
+            # drop the buffers that have been sent completely, and move the cursor of the partial one
+            i = 0
+            while i < len(views) and pack_size >= len(views[i]):
+                pack_size -= len(views[i])
+                i += 1
+            views = views[i:]
+            if pack_size > 0:
+                views[0] = views[0][pack_size:]
+
+    @property
+    def codec(self):
+        return self._codec
+
+    @property
+    def compressor(self):
+        return self._compressor
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def close(self):
         with self._call_lock:
-            method_name = pb.get_request_name(pb_req)
-        self._send(call_id, method_name, pb_req)
-
-        # receive response
-        header, data, error = self._receive()
-        call_id_ = header.call_id
-        if call_id_ != call_id:
-            self._put_response(call_id_, header, data, error)
-            self._notify_call(call_id_)
-            self._wait_call(call_id)
-            header, data, error = self._get_response(call_id)
-        if error:
-            if error == 'org.apache.hadoop.hbase.exceptions.RegionMovedException':
-                raise exceptions.RegionMovedError(error)
-            elif error == 'org.apache.hadoop.hbase.NotServingRegionException':
-                raise exceptions.NotServingRegionError()
-            elif error == 'org.apache.hadoop.hbase.regionserver.RegionServerStoppedException':
-                raise exceptions.RegionServerStoppedError(error)
-            elif error == 'org.apache.hadoop.hbase.exceptions.RegionOpeningException':
-                raise exceptions.RegionOpeningError(error)
-            elif error == 'org.apache.hadoop.hbase.RegionTooBusyException':
-                raise exceptions.RegionTooBusyError(error)
-            else:
-                raise exceptions.RequestError(error)
-        pb_resp_size, resp_obj_start = decode_varint(data, 0)
-        pb_resp = pb.get_response_object(method_name)
-        pb_resp.ParseFromString(data[resp_obj_start: resp_obj_start + pb_resp_size])
-        return pb_resp
+            if self._closed:
+                return
+            self._closed = True
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except socket.error:
+            pass
+        self._sock.close()
+        # print('DEBUG: connection to %s:%d closed.' % (self._host, self._port))
 
-    def _send(self, call_id, method_name, pb_req):
-        pb_header = pb.RequestHeader()
-        pb_header.call_id = call_id
-        pb_header.method_name = method_name
-        pb_header.request_param = True
-        header_bytes = pb_header.SerializeToString()
-        header_size = len(header_bytes)
+    def call(self, pb_req, timeout=None, with_cells=False, cell_block=None):
+        """Send a request and wait for its response.
 
+        Args:
+            pb_req: Request object.
+            timeout (float|None): Max seconds to wait. None means wait until the response arrives
+                or the connection fails.
+            with_cells (bool): Also return the cells carried in the cell block of the response.
+            cell_block (bytes|bytearray|None): Cell block sent along with the request.
+                It requires the codec to be negotiated.
+
+        Returns:
+            Response object.
+            tuple: (response object, list[codec.Cell]) if with_cells is True.
+
+        Raises:
+            exceptions.TransportError: Failed to send or receive messages.
+            exceptions.ServiceProtocolError: Invalid response.
+            exceptions.RequestError: The server returned an exception.
+
+        """
+        call_id, future = self._call(pb_req, with_cells, cell_block)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            # the response is dropped by the reader thread if it arrives later
+            with self._call_lock:
+                self._future_dict.pop(call_id, None)
+            future.cancel()
+            raise exceptions.TransportError(
+                'Request to server %s:%d timed out.' % (self._host, self._port)
+            )
+
+    def call_async(self, pb_req, with_cells=False, cell_block=None):
+        """Send a request without waiting for its response.
+
+        Args:
+            pb_req: Request object.
+            with_cells (bool): The future also carries the cells in the cell block of the response.
+            cell_block (bytes|bytearray|None): Cell block sent along with the request.
+                It requires the codec to be negotiated.
+
+        Returns:
+            concurrent.futures.Future: Future of the response object,
+                or (response object, list[codec.Cell]) if with_cells is True.
+
+        Raises:
+            exceptions.TransportError: Failed to send the request.
+
+        """
+        return self._call(pb_req, with_cells, cell_block)[1]
+
+    def _call(self, pb_req, with_cells, cell_block):
+        """Register and send a call.
+
+        Returns:
+            tuple: (call_id, concurrent.futures.Future)
+
+        """
+        method_name = pb.get_request_name(pb_req)
+        if cell_block is not None and self._codec is None:
+            raise ValueError('Cell block can not be sent without a codec.')
+        future = concurrent.futures.Future()
+        with self._call_lock:
+            if self._closed:
+                raise exceptions.TransportError(
+                    'Connection to server %s:%d has been closed.' % (self._host, self._port)
+                )
+            call_id = self._call_id
+            self._call_id = (call_id + 1) & 0x7fffffff
+            self._future_dict[call_id] = (method_name, with_cells, future)
+
+        try:
+            self._send(call_id, method_name, pb_req, cell_block)
+        except exceptions.TransportError as e:
+            self._abort(e)
+            raise e
+        except Exception:
+            # e.g., EncodeError, the request never reached the server
+            with self._call_lock:
+                self._future_dict.pop(call_id, None)
+            raise
+        return call_id, future
+
+    def _send(self, call_id, method_name, pb_req, cell_block=None):
+        #
+        # message RequestHeader {
+        #   optional uint32 call_id = 1;
+        #   optional RPCTInfo trace_info = 2;
+        #   optional string method_name = 3;
+        #   optional bool request_param = 4;
+        #   optional CellBlockMeta cell_block_meta = 5;
+        #   optional uint32 priority = 6;
+        # }
+        # Only call_id changes between calls, so the header is built by prefixing the encoded
+        # call_id (field 1, varint) to the cached serialization of the other fields.
+        # Concatenated serializations of the same message type are merged by the parser.
+        header_bytes = b'\x08' + encode_varint(call_id) + _header_suffix(method_name)
+        if cell_block:
+            if self._compressor is not None:
+                cell_block = codec.compress(cell_block, self._compressor)
+            # message CellBlockMeta {
+            #   optional uint32 length = 1;
+            # }
+            meta_bytes = b'\x08' + encode_varint(len(cell_block))
+            header_bytes += b'\x2a' + encode_varint(len(meta_bytes)) + meta_bytes
+        else:
+            cell_block = b''
         req_bytes = pb_req.SerializeToString()
         req_size_bytes = encode_varint(len(req_bytes))
+        header_size_bytes = encode_varint(len(header_bytes))
 
-        total_size = 1 + len(header_bytes) + len(req_size_bytes) + len(req_bytes)
+        total_size = len(header_size_bytes) + len(header_bytes) + len(req_size_bytes) + len(req_bytes) + len(cell_block)
         # Total length doesn't include the initial 4 bytes (for the total_length uint32)
-        to_send = struct.pack(">IB", total_size, header_size)
-        to_send += header_bytes + req_size_bytes + req_bytes
+        prefix = b''.join((
+            struct.pack('>I', total_size),
+            header_size_bytes,
+            header_bytes,
+            req_size_bytes
+        ))
+
+        with self._send_lock:
+            self._sock_send_buffers((prefix, req_bytes, cell_block))
+
+    def _read_loop(self):
+        """Receive responses and dispatch them to the waiting futures.
 
+        This is the body of the reader thread. It exits when the connection is closed or broken,
+        and all the calls still in flight fail with exceptions.TransportError.
+
+        """
+        try:
+            while True:
+                header, data, error = self._receive()
+                with self._call_lock:
+                    try:
+                        method_name, with_cells, future = self._future_dict.pop(header.call_id)
+                    except KeyError:
+                        # nobody is waiting for this call
+                        continue
+                if not future.set_running_or_notify_cancel():
+                    # the caller cancelled the call
+                    continue
+                if error:
+                    future.set_exception(make_error(error))
+                    continue
+                try:
+                    pb_resp_size, resp_obj_start = decode_varint(data, 0)
+                    resp_obj_end = resp_obj_start + pb_resp_size
+                    pb_resp = pb.get_response_object(method_name)
+                    pb_resp.ParseFromString(data[resp_obj_start: resp_obj_end])
+                    # the cells must be decoded here since the receive buffer is reused by the next frame
+                    cell_block_size = header.cell_block_meta.length
+                    if cell_block_size > 0:
+                        if not with_cells:
+                            raise exceptions.ServiceProtocolError(
+                                'Unexpected cell block in %s response.' % method_name
+                            )
+                        cell_block = data[resp_obj_end: resp_obj_end + cell_block_size]
+                        if self._compressor is not None:
+                            cell_block = codec.decompress(cell_block)
+                        cells = codec.decode_cells(cell_block)
+                    else:
+                        cells = []
+                except (exceptions.ServiceProtocolError, DecodeError) as e:
+                    future.set_exception(exceptions.ServiceProtocolError(
+                        'Failed to parse %s response from server %s:%d. %s' % (
+                            method_name, self._host, self._port, str(e)
+                        )
+                    ))
+                    continue
+                future.set_result((pb_resp, cells) if with_cells else pb_resp)
+        except exceptions.TransportError as e:
+            self._abort(e)
+        except exceptions.ProtocolError as e:
+            self._abort(exceptions.TransportError(str(e)))
+
+    def _abort(self, error):
+        """Close the connection and fail all the calls in flight.
+
+        Args:
+            error (exceptions.TransportError): The error passed to the futures.
+
+        """
         with self._call_lock:
-            self._sock_send(to_send)
+            closed = self._closed
+            self._closed = True
+            future_dict = self._future_dict
+            self._future_dict = dict()
+        if closed:
+            error = exceptions.TransportError(
+                'Connection to server %s:%d has been closed.' % (self._host, self._port)
+            )
+        else:
+            try:
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except socket.error:
+                pass
+            self._sock.close()
+        for _, _, future in future_dict.values():
+            if future.set_running_or_notify_cancel():
+                future.set_exception(error)
 
     def _receive(self):
-        with self._call_lock_:
-            data = self._sock_recv(4)
-            total_size = struct.unpack(">I", data)[0]
-            data = self._sock_recv(total_size)
+        """Receive one response frame.
+
+        The frame is read into the reusable receive buffer, and the returned data is a memoryview into
+        that buffer. It is only valid until the next call, so the response must be parsed before
+        receiving the next frame.
+
+        Returns:
+            tuple: (pb_header, data, error)
+
+        """
+        self._sock_recv_into(self._size_view, 4, wait=True)
+        total_size = struct.unpack_from('>I', self._size_buffer)[0]
+        if total_size > len(self._recv_buffer):
+            if total_size > MAX_KEPT_BUFFER_SIZE:
+                # do not hold huge buffers forever
+                buffer = bytearray(total_size)
+            else:
+                buffer = bytearray(max(total_size, 2 * len(self._recv_buffer)))
+                self._recv_buffer = buffer
+        else:
+            buffer = self._recv_buffer
+        data = memoryview(buffer)[:total_size]
+        self._sock_recv_into(data, total_size)
 
         header_size, header_start = decode_varint(data, 0)
         header_end = header_start + header_size
         pb_header = pb.ResponseHeader()
-        pb_header.ParseFromString(data[header_start: header_end])
+        try:
+            pb_header.ParseFromString(data[header_start: header_end])
+        except DecodeError:
+            raise exceptions.ServiceProtocolError(
+                'Failed to parse response header from server %s:%d.' % (self._host, self._port)
+            )
 
         error = pb_header.exception.exception_class_name
         if error:
             return pb_header, None, error
         return pb_header, data[header_end:], None
 
-    def _sock_recv(self, n):
-        buffer = io.BytesIO()
+    def _is_idle(self):
+        with self._call_lock:
+            return not self._closed and not self._future_dict
+
+    def _sock_recv_into(self, view, n, wait=False):
+        """Receive exactly n bytes into the given buffer.
+
+        Args:
+            view (memoryview): Writable buffer with at least n bytes.
+            n (int): Number of bytes.
+            wait (bool): If set to True, keep waiting on an idle connection
+                (no data received and no call in flight) instead of treating the timeout as an error.
+
+        Raises:
+            exceptions.TransportError: Failed to receive, or the connection is closed.
+
+        """
         received = 0
         while received < n:
             try:
-                data = self._sock.recv(n - received)
+                size = self._sock.recv_into(view[received:n])
+            except socket.timeout:
+                if wait and received == 0 and self._is_idle():
+                    continue
+                raise exceptions.TransportError(
+                    'Timed out when receiving response from server %s:%d.' % (self._host, self._port)
+                )
             except socket.error:
                 raise exceptions.TransportError(
                     'Failed to receive response to server %s:%d.' % (self._host, self._port)
                 )
-            if not data:
+            if size == 0:
                 raise exceptions.TransportError(
                     'Failed to receive response to server %s:%d.' % (self._host, self._port)
                 )
-            received += len(data)
-            buffer.write(data)
-        return buffer.getvalue()
+            received += size
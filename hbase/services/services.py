@@ -47,24 +47,65 @@ class Service(object):
     def _rebuild_request(self):
         raise NotImplementedError()
 
-    def request(self, pb_req):
+    def request(self, pb_req, with_cells=False, cell_block=None):
         """Send a request to the service.
 
         Args:
             pb_req: Request object.
+            with_cells (bool): Also return the cells carried in the cell block of the response.
+            cell_block (bytes|bytearray|None): Cell block sent along with the request.
 
         Returns:
             Response object.
+            tuple: (response object, list[codec.Cell]) if with_cells is True.
 
         """
+        request_ = self._request
         try:
-            return self._request.call(pb_req)
-        except exceptions.TransportError or exceptions.ProtocolError:
-            for _ in range(3):
-                time.sleep(3)
-                with self._lock:
-                    self._rebuild_request()
-                return self._request.call(pb_req)
+            return request_.call(pb_req, with_cells=with_cells, cell_block=cell_block)
+        except exceptions.TransportError:
+            time.sleep(3)
+            request_ = self._recover(request_)
+            return request_.call(pb_req, with_cells=with_cells, cell_block=cell_block)
+
+    def request_async(self, pb_req, with_cells=False, cell_block=None):
+        """Send a request to the service without waiting for the response.
+
+        Many requests can be in flight on the same connection.
+
+        Args:
+            pb_req: Request object.
+            with_cells (bool): The future also carries the cells in the cell block of the response.
+            cell_block (bytes|bytearray|None): Cell block sent along with the request.
+
+        Returns:
+            concurrent.futures.Future: Future of the response object,
+                or (response object, list[codec.Cell]) if with_cells is True.
+
+        """
+        request_ = self._request
+        try:
+            return request_.call_async(pb_req, with_cells, cell_block)
+        except exceptions.TransportError:
+            request_ = self._recover(request_)
+            return request_.call_async(pb_req, with_cells, cell_block)
+
+    def _recover(self, broken):
+        """Rebuild the connection if it is still the broken one.
+
+        Args:
+            broken (request.Request): The request object which failed.
+
+        Returns:
+            request.Request: The usable request object.
+
+        """
+        with self._lock:
+            if self._request is broken:
+                if broken is not None:
+                    broken.close()
+                self._rebuild_request()
+            return self._request
 
 
 class MasterService(Service):
@@ -117,18 +158,36 @@ class MetaService(Service):
 
 class RegionService(Service):
 
-    def __init__(self, host, port):
+    def __init__(self, host, port, codec=None, compressor=None):
         """Region service.
 
         Args:
             host (str): Hostname or IP address.
             port (int): Port number.
+            codec (str|None): Cell block codec class to negotiate with the region server.
+            compressor (str|None): Cell block compressor class to negotiate with the region server.
 
         Raises:
             exceptions.TransportError: Failed to connect.
 
         """
+        self._codec = codec
+        self._compressor = compressor
         super(RegionService, self).__init__(host, port)
 
+    @property
+    def codec(self):
+        return self._codec
+
+    @property
+    def compressor(self):
+        return self._compressor
+
     def _rebuild_request(self):
-        self._request = request.Request(self._host, self._port, 'ClientService')
+        self._request = request.Request(
+            self._host,
+            self._port,
+            'ClientService',
+            self._codec,
+            self._compressor
+        )
@@ -124,8 +124,9 @@ class StreamReader(object):
 
         self._table = table
         self._filename = filename
-        self._column = column
-        self.meta = json.loads(meta_row[column].decode())
+        # the rows are keyed by bytes column names if the client has binary keys
+        self._column = client.row_column(column, table.client.binary_keys)
+        self.meta = json.loads(meta_row[self._column].decode())
 
         self._chunk_size = self.meta['chunk_size']
         self._num_chunks = self.meta['num_chunks']
@@ -6,11 +6,16 @@
 """
 
 import os
+import struct
+import threading
 from collections import deque
 
 from . import client
+from . import columnar
+from . import mutator as _mutator
 from . import stream_io
 from .client import filters
+from .exceptions import UnknownServiceError
 
 
 class Table(object):
@@ -96,7 +101,7 @@ class Table(object):
         """Get a row with the row key.
 
         Args:
-            key (str): Row key.
+            key (str|bytes): Row key.
             columns (tuple[str]|list[str]): Columns to get.
             filter_ (client.filters.Filter): Filter object.
 
@@ -116,6 +121,40 @@ class Table(object):
         """
         return self._client.get(self._full_name, key, columns, filter_)
 
+    def get_many(self, keys, columns=None, filter_=None, max_in_flight=4):
+        """Get rows with the row keys.
+
+        The keys are grouped by region server, and each Multi request carries at most
+        read_batch_size keys.
+
+        Args:
+            keys (list[str|bytes]|tuple[str|bytes]): Row keys.
+            columns (tuple[str]|list[str]): Columns to get.
+            filter_ (client.filters.Filter): Filter object.
+            max_in_flight (int): Max number of Multi requests in flight to each region server.
+
+        Returns:
+            list[client.Row|None]: The rows in the same order as the keys. None if the row does not exist.
+
+        Raises:
+            RegionError
+            RequestError
+
+            TransportError
+            ZookeeperProtocolError
+            ServiceProtocolError
+            NoSuchZookeeperNodeError
+
+        """
+        return self._client.get_many(
+            self._full_name,
+            keys,
+            columns,
+            filter_,
+            batch_size=self._read_batch_size,
+            max_in_flight=max_in_flight
+        )
+
     def get_one(self, key_only=False):
         """Get the first rows sample from the table.
 
@@ -144,43 +183,256 @@ class Table(object):
              end_row=None,
              columns=None,
              filter_=None,
-             batch_size=None):
+             batch_size=None,
+             parallelism=1,
+             ordered=True,
+             prefetch=None,
+             max_prefetch_bytes=None,
+             max_result_size=None,
+             limit=None,
+             small=None,
+             renew_interval=None,
+             reversed=False,
+             lazy=False):
         """Scan the table.
 
+        When parallelism > 1, the key range is split by region and up to parallelism regions are scanned
+        at the same time. In ordered mode, the rows are still returned in key order. Otherwise, they are
+        returned as they arrive, which is faster when the order does not matter, e.g., exporting or counting.
+
+        When prefetch > 0, the next batches are fetched in background while the current one is consumed,
+        so the region servers do not wait for the consumer.
+
         Args:
-            start_row (str): Start rwo key.
-            end_row (str): End row key.
+            start_row (str|bytes): Start rwo key.
+            end_row (str|bytes): End row key.
             columns (tuple[str]|list[str]): Columns.
             filter_ (hbase.filters.Filter): Filter.
             batch_size (int): Max number of rows in each request.
                 None means use the table's read_batch_size.
+            parallelism (int): Max number of regions scanned at the same time.
+            ordered (bool): Return the rows in key order. Only used when parallelism > 1.
+            prefetch (int|None): Max number of batches fetched ahead for each scanning region.
+                None means 2 for parallel scans and no prefetch otherwise.
+            max_prefetch_bytes (int|None): Max number of bytes fetched ahead. None means no limit.
+            max_result_size (int|None): Max number of bytes in each request. Rows larger than it are
+                returned in parts and stitched by the client. None means use the region server's default.
+            limit (int|None): Max number of rows returned. None means no limit.
+            small (bool|None): Open, iterate and close each region scanner in one request, which is faster
+                for short scans. None means to use it if limit rows can be returned in one request.
+            renew_interval (float|None): Renew the scanner leases when the cursor is idle for renew_interval
+                seconds, so that slow consumers do not lose the scanners. It should be less than the scanner
+                lease period of the region servers. None means never renew.
+            reversed (bool): Scan in descending key order. The start row is then the largest row (inclusive)
+                and the end row is the smallest row (exclusive).
+            lazy (bool): Return client.LazyRow objects, which decode the row keys and the column names only when
+                they are accessed. They use less memory and CPU when only some of the columns are read.
 
         Returns:
             Cursor: Cursor object if success.
+            ParallelCursor: Cursor object if parallelism > 1 or prefetch > 0.
+
+        Raises:
+            RequestError
+
+            TransportError
+            ZookeeperProtocolError
+            ServiceProtocolError
+            NoSuchZookeeperNodeError
 
         """
+        if parallelism <= 0:
+            raise ValueError('parallelism should be positive value.')
         scanner = self._client.create_scanner(
             self._full_name,
             start_key=start_row,
             end_key=end_row,
             columns=columns,
             filter_=filter_,
-            num_rows=batch_size if batch_size is not None else self._read_batch_size
+            num_rows=batch_size if batch_size is not None else self._read_batch_size,
+            max_result_size=max_result_size,
+            limit=limit,
+            small=small,
+            reversed=reversed,
+            row_factory=self._lazy_row_factory() if lazy else None
+        )
+        if parallelism == 1:
+            if not prefetch:
+                return Cursor(self, scanner, renew_interval)
+            return ParallelCursor(
+                self,
+                [scanner],
+                1,
+                True,
+                prefetch,
+                max_prefetch_bytes,
+                renew_interval=renew_interval
+            )
+        scanners = self._client.split_scanner(scanner)
+        return ParallelCursor(
+            self,
+            scanners,
+            parallelism,
+            ordered,
+            prefetch if prefetch else 2,
+            max_prefetch_bytes,
+            limit,
+            renew_interval
+        )
+
+    def scan_ranges(self,
+                    ranges,
+                    columns=None,
+                    filter_=None,
+                    batch_size=None,
+                    parallelism=1,
+                    prefetch=None,
+                    max_prefetch_bytes=None,
+                    max_result_size=None,
+                    lazy=False):
+        """Scan several key ranges of the table.
+
+        The ranges are sorted, merged and grouped by region. Each region is scanned by one scanner, which skips
+        the rows between the ranges on the server side. The rows are returned in key order.
+
+        Args:
+            ranges (list[tuple]|tuple[tuple]): (start_row, end_row) pairs.
+                The start rows are inclusive and the end rows are exclusive. None means no limit.
+            columns (tuple[str]|list[str]): Columns.
+            filter_ (hbase.filters.Filter): Filter.
+            batch_size (int): Max number of rows in each request.
+                None means use the table's read_batch_size.
+            parallelism (int): Max number of regions scanned at the same time.
+            prefetch (int|None): Max number of batches fetched ahead for each scanning region. None means 2.
+            max_prefetch_bytes (int|None): Max number of bytes fetched ahead. None means no limit.
+            max_result_size (int|None): Max number of bytes in each request.
+            lazy (bool): Return client.LazyRow objects instead of client.Row objects.
+
+        Returns:
+            ParallelCursor: Cursor object.
+
+        Raises:
+            RequestError
+
+            TransportError
+            ZookeeperProtocolError
+            ServiceProtocolError
+            NoSuchZookeeperNodeError
+
+        """
+        if parallelism <= 0:
+            raise ValueError('parallelism should be positive value.')
+        scanners = self._client.create_range_scanners(
+            self._full_name,
+            ranges,
+            columns=columns,
+            filter_=filter_,
+            num_rows=batch_size if batch_size is not None else self._read_batch_size,
+            max_result_size=max_result_size,
+            row_factory=self._lazy_row_factory() if lazy else None
+        )
+        return ParallelCursor(
+            self,
+            scanners,
+            parallelism,
+            True,
+            prefetch if prefetch else 2,
+            max_prefetch_bytes
         )
-        return Cursor(self, scanner)
+
+    def scan_batches(self,
+                     columns,
+                     dtypes=None,
+                     start_row=None,
+                     end_row=None,
+                     filter_=None,
+                     batch_size=None,
+                     max_result_size=None,
+                     limit=None):
+        """Scan the table and return the rows in column batches.
+
+        Each response of the region servers becomes a column batch, which has the row keys and a numpy array for
+        each column. The cells are not converted to Row objects, and the values of a typed column are decoded
+        at once for the whole batch, which is much faster for analytic scans. numpy is required.
+
+        Args:
+            columns (tuple[str]|list[str]): Columns in the batches, e.g., ['cf:a', 'cf:b'].
+                Only these columns are scanned.
+            dtypes (dict[str, T]): Column name => numpy dtype of its values, e.g., {'cf:a': '>i8'}.
+                The columns without dtype are object arrays of bytes.
+            start_row (str|bytes): Start row key.
+            end_row (str|bytes): End row key.
+            filter_ (hbase.filters.Filter): Filter.
+            batch_size (int): Max number of rows in each batch.
+                None means use the table's read_batch_size.
+            max_result_size (int|None): Max number of bytes in each request.
+            limit (int|None): Max number of rows returned. None means no limit.
+
+        Returns:
+            iterator[hbase.columnar.ColumnBatch]: The batches in key order.
+
+        Raises:
+            ImportError: numpy is not installed.
+            ValueError: A value does not have the size of its dtype.
+            RegionError
+            RequestError
+
+            TransportError
+            ZookeeperProtocolError
+            ServiceProtocolError
+            NoSuchZookeeperNodeError
+
+        """
+        # fail early if numpy is missing or the columns or dtypes are invalid
+        columnar.make_batch([], columns, dtypes)
+        scanner = self._client.create_scanner(
+            self._full_name,
+            start_key=start_row,
+            end_key=end_row,
+            columns=columns,
+            filter_=filter_,
+            num_rows=batch_size if batch_size is not None else self._read_batch_size,
+            max_result_size=max_result_size,
+            limit=limit,
+            row_factory=columnar.make_cell_row
+        )
+        return self._iter_batches(scanner, columns, dtypes)
+
+    def _lazy_row_factory(self):
+        if self._client.binary_keys:
+            return client.LazyRow.from_binary_cells
+        return client.LazyRow.from_cells
+
+    def _iter_batches(self, scanner, columns, dtypes):
+        try:
+            while True:
+                rows = self._client.iter_scanner(scanner)
+                if rows is None:
+                    break
+                if rows:
+                    yield columnar.make_batch(rows, columns, dtypes, self._client.binary_keys)
+        finally:
+            self._client.delete_scanner(scanner)
 
     def count(self,
               start_row=None,
               end_row=None,
               verbose=None,
-              verbose_interval=1000):
+              verbose_interval=1000,
+              method='scan',
+              filter_=None):
         """Count the number of the rows in the table.
 
         Args:
-            start_row (str): Start rwo key.
-            end_row (str): End row key.
+            start_row (str|bytes): Start rwo key.
+            end_row (str|bytes): End row key.
             verbose ((int, hbase.client.Row) -> T): Callback to notify the counting progress.
+                It is not called when the rows are counted by the coprocessor.
             verbose_interval (int): Interval counts between verbose calls.
+            method (str): 'scan' to count the row keys on the client side, or 'coprocessor' to count the rows
+                on the region servers with the aggregate coprocessor. If the coprocessor is not loaded,
+                it falls back to scan.
+            filter_ (hbase.filters.Filter): Filter. Only the rows it accepts are counted.
 
         Returns:
             int: The number of rows.
@@ -195,12 +447,29 @@ class Table(object):
             NoSuchZookeeperNodeError
 
         """
+        if method == 'coprocessor':
+            try:
+                return self._client.aggregate(
+                    self._full_name,
+                    'count',
+                    start_key=start_row,
+                    end_key=end_row,
+                    filter_=filter_
+                )
+            except UnknownServiceError:
+                pass
+        elif method != 'scan':
+            raise ValueError('method should be one of {\'scan\', \'coprocessor\'}.')
+        # the values are not needed, KeyOnlyFilter only strips them after the other filters accept the cells
+        key_filter = filters.KeyOnlyFilter()
+        if filter_ is not None:
+            key_filter = filters.FilterList([filter_, key_filter])
         count = 0
         if verbose is None:
             for _ in self.scan(
                     start_row=start_row,
                     end_row=end_row,
-                    filter_=filters.KeyOnlyFilter(),
+                    filter_=key_filter,
                     batch_size=500
             ):
                 count += 1
@@ -208,7 +477,7 @@ class Table(object):
             for row in self.scan(
                     start_row=start_row,
                     end_row=end_row,
-                    filter_=filters.KeyOnlyFilter(),
+                    filter_=key_filter,
                     batch_size=500
             ):
                 count += 1
@@ -216,14 +485,35 @@ class Table(object):
                     verbose(count, row)
         return count
 
-    def put(self, row, callback=None):
-        """Put one row into the table.
+    def aggregate(self,
+                  column,
+                  op,
+                  start_row=None,
+                  end_row=None,
+                  filter_=None,
+                  method='coprocessor',
+                  max_in_flight=4):
+        """Aggregate a numeric column.
+
+        The values are 8 bytes signed big endian integers, and cells of other sizes are ignored
+        except by 'count', which counts the rows having the column.
+        With the 'coprocessor' method, every region computes its part with the aggregate coprocessor.
+        If the coprocessor is not loaded, it falls back to scan.
 
         Args:
-            row (hbase.client.Row): Row object.
-            callback (callable|None): Callback when the put operation complete.
+            column (str|None): The column to aggregate. For 'count', None means count all the rows.
+            op (str): One of {'count', 'sum', 'min', 'max', 'avg', 'std'}.
+            start_row (str|bytes): Start row key.
+            end_row (str|bytes): End row key.
+            filter_ (hbase.filters.Filter): Filter.
+            method (str): 'coprocessor' or 'scan'.
+            max_in_flight (int): Max number of coprocessor calls in flight to each region server.
+
+        Returns:
+            int|float|None: The result. None if there is no value, except that count returns 0.
 
         Raises:
+            ValueError: Unsupported aggregation or method.
             RegionError
             RequestError
 
@@ -233,12 +523,187 @@ class Table(object):
             NoSuchZookeeperNodeError
 
         """
-        self._conn.threads.put_task(
+        if op not in client.AGGREGATE_METHODS:
+            raise ValueError(
+                'Unsupported aggregation %s. It should be one of %s.' % (op, str(sorted(client.AGGREGATE_METHODS)))
+            )
+        if column is None and op != 'count':
+            raise ValueError('A column is required by %s.' % op)
+        if method == 'coprocessor':
+            try:
+                return self._client.aggregate(
+                    self._full_name,
+                    op,
+                    column,
+                    start_key=start_row,
+                    end_key=end_row,
+                    filter_=filter_,
+                    max_in_flight=max_in_flight
+                )
+            except UnknownServiceError:
+                pass
+        elif method != 'scan':
+            raise ValueError('method should be one of {\'scan\', \'coprocessor\'}.')
+
+        if column is None:
+            return self.count(start_row, end_row, filter_=filter_)
+        aggregator = client.Aggregator(op)
+        key = client.row_column(column, self._client.binary_keys)
+        for row in self.scan(start_row=start_row, end_row=end_row, columns=[column], filter_=filter_):
+            data = row.get(key)
+            if data is None:
+                continue
+            if op == 'count':
+                aggregator.add(None)
+                continue
+            if len(data) != 8:
+                continue
+            part = _long.unpack(data)[0]
+            aggregator.add(part, 1, part * part)
+        return aggregator.result()
+
+    def coprocessor_exec(self,
+                         service_name,
+                         method_name,
+                         request,
+                         response_type=None,
+                         start_row=None,
+                         end_row=None,
+                         max_in_flight=4,
+                         stream=False):
+        """Call a coprocessor endpoint on every region of a key range concurrently.
+
+        Args:
+            service_name (str): Full name of the coprocessor service.
+            method_name (str): Method name of the service.
+            request (bytes|google.protobuf.message.Message): The request message sent to every region.
+            response_type (type|None): Protobuf message class to parse the responses.
+                None means to return the serialized responses.
+            start_row (str|bytes): Start row key.
+            end_row (str|bytes): End row key.
+            max_in_flight (int): Max number of requests in flight to each region server.
+            stream (bool): Return an iterator of (region, response) in completion order,
+                instead of waiting for all the regions.
+
+        Returns:
+            dict[hbase.client.region.Region, T]: Region => response.
+            iterator: (hbase.client.region.Region, response) if stream is True.
+
+        Raises:
+            UnknownServiceError: The coprocessor service is not loaded.
+            RegionError
+            RequestError
+
+            TransportError
+            ZookeeperProtocolError
+            ServiceProtocolError
+            NoSuchZookeeperNodeError
+
+        """
+        results = self._client.coprocessor_exec(
+            self._full_name,
+            service_name,
+            method_name,
+            request,
+            response_type,
+            start_key=start_row,
+            end_key=end_row,
+            max_in_flight=max_in_flight
+        )
+        if stream:
+            return results
+        return {region: resp for region, resp in results}
+
+    def put(self, row, callback=None):
+        """Put one row into the table.
+
+        The put runs in the connection's executor. Errors are set to the returned future,
+        and are also raised by Connection.flush() or Connection.close().
+
+        Args:
+            row (hbase.client.Row): Row object.
+            callback (callable|None): Callback when the put operation succeeds.
+
+        Returns:
+            concurrent.futures.Future: Future of the put. Its result is None when the row is put.
+                Its exception can be one of:
+                RegionError
+                RequestError
+
+                TransportError
+                ZookeeperProtocolError
+                ServiceProtocolError
+                NoSuchZookeeperNodeError
+
+        """
+        return self._conn.executor.submit(
             self._client.put,
             (self._full_name, row),
             callback
         )
 
+    def put_many(self, rows, max_in_flight=4):
+        """Put rows into the table with Multi requests.
+
+        The rows are grouped by region server, and each Multi request carries at most
+        write_batch_size rows.
+
+        Args:
+            rows (list[hbase.client.Row]|tuple[hbase.client.Row]): Rows to put.
+            max_in_flight (int): Max number of Multi requests in flight to each region server.
+
+        Returns:
+            list[bool|Exception]: True for each row put, or the error for each row failed.
+                The order is the same as the input rows.
+
+        Raises:
+            TransportError
+            ZookeeperProtocolError
+            ServiceProtocolError
+            NoSuchZookeeperNodeError
+
+        """
+        return self._client.put_many(
+            self._full_name,
+            rows,
+            batch_size=self._write_batch_size,
+            max_in_flight=max_in_flight
+        )
+
+    def mutator(self,
+                max_bytes=2097152,
+                max_rows=None,
+                flush_interval=1.0,
+                max_in_flight=4):
+        """Create a buffered mutator.
+
+        The mutator buffers puts and deletes per region server and sends them in the background with
+        Multi requests. It should be used as a context manager, or be closed explicitly:
+
+            with table.mutator() as m:
+                m.put(row)
+                m.delete(key)
+
+        Args:
+            max_bytes (int): Max number of bytes buffered. Writers block when it is reached.
+            max_rows (int): Max number of mutations buffered for one region server.
+                None means use the table's write_batch_size.
+            flush_interval (float|None): Max seconds a mutation stays in the buffer.
+                None means no time based flush.
+            max_in_flight (int): Max number of Multi requests in flight to each region server.
+
+        Returns:
+            mutator.Mutator: The mutator.
+
+        """
+        return _mutator.Mutator(
+            self,
+            max_bytes,
+            max_rows if max_rows is not None else self._write_batch_size,
+            flush_interval,
+            max_in_flight
+        )
+
     def check_and_put(self,
                       row,
                       check_column=None,
@@ -274,7 +739,7 @@ class Table(object):
         """Delete a row by key.
 
         Args:
-            key (str): Row key.
+            key (str|bytes): Row key.
 
         Raises:
             RegionError
@@ -404,12 +869,14 @@ class Table(object):
 
 class Cursor(object):
 
-    def __init__(self, table, scanner):
+    def __init__(self, table, scanner, renew_interval=None):
         """Cursor object.
 
         Args:
             table (Table): Table object.
             scanner (client.Scanner): Scanner object.
+            renew_interval (float|None): Renew the scanner lease when the cursor is idle for renew_interval seconds.
+                None means never renew.
 
         """
         self._table = table
@@ -419,10 +886,17 @@ class Cursor(object):
         self._full_name = table.full_name
         self._buffer = deque()
 
+        self._renewer = None
+        if renew_interval is not None:
+            self._renewer = client.LeaseRenewer(self._client, [scanner], renew_interval)
+
     def __del__(self):
         self.close()
 
     def close(self):
+        if self._renewer is not None:
+            self._renewer.stop()
+            self._renewer = None
         if self.scanner is not None:
             self._client.delete_scanner(self.scanner)
             self.scanner = None
@@ -480,3 +954,254 @@ class Cursor(object):
                 raise StopIteration()
             self._buffer.extend(batch)
         return self._buffer.popleft()
+
+
+class ParallelCursor(object):
+
+    def __init__(self,
+                 table,
+                 scanners,
+                 parallelism,
+                 ordered,
+                 max_batches=2,
+                 max_bytes=None,
+                 limit=None,
+                 renew_interval=None):
+        """Cursor which iterates scanners in background threads.
+
+        The scanners are taken in order by at most parallelism threads. Each running scanner fetches at most
+        max_batches batches ahead of the consumer, and all the scanners together buffer about max_bytes
+        bytes at most. With one scanner, this is a cursor which prefetches the next batches while the
+        current one is consumed.
+        Call close(), or use the cursor in a with statement, when it is not iterated to the end.
+        Otherwise, the threads and the region scanners are only released when the cursor is garbage collected.
+
+        Args:
+            table (Table): Table object.
+            scanners (list[client.Scanner]): Scanners in key order, e.g., from client.Client.split_scanner().
+            parallelism (int): Max number of scanners iterated at the same time.
+            ordered (bool): Return the rows in the order of the scanners. Otherwise, return them as they arrive.
+            max_batches (int): Max number of batches buffered for each running scanner.
+            max_bytes (int|None): Max number of bytes buffered. None means no limit.
+            limit (int|None): Max number of rows returned. None means no limit.
+            renew_interval (float|None): Renew the scanner leases when the scanners are idle, e.g., waiting for
+                the buffered rows to be consumed, for renew_interval seconds. None means never renew.
+
+        """
+        if max_batches <= 0:
+            raise ValueError('max_batches should be positive value.')
+        self._table = table
+        self._scanners = scanners
+        self._rows_left = limit
+
+        self._client = table.client
+        self._full_name = table.full_name
+        self._buffer = deque()
+
+        self._renewer = None
+        if renew_interval is not None:
+            self._renewer = client.LeaseRenewer(self._client, scanners, renew_interval)
+
+        # the threads only hold the shared state, so the cursor is closed by __del__ if it is dropped
+        self._state = _ParallelScanState(self._client, scanners, ordered, max_batches, max_bytes, parallelism)
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._state.run, name='hbase-scan-%s' % self._full_name)
+            for _ in range(min(parallelism, len(scanners)))
+        ]
+        for thread in self._threads:
+            thread.daemon = True
+            thread.start()
+
+    def __del__(self):
+        if hasattr(self, '_threads'):
+            self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        state = self._state
+        with state.cond:
+            state.closed = True
+            state.cond.notify_all()
+        if self._renewer is not None:
+            self._renewer.stop()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join()
+        for scanner in self._scanners:
+            if scanner.__scanner_id__ is not None:
+                self._client.delete_scanner(scanner)
+                scanner.__scanner_id__ = None
+
+    def _fill_buffer(self):
+        state = self._state
+        while len(self._buffer) == 0:
+            with state.cond:
+                if state.num_done >= len(self._scanners):
+                    return False
+                scan_queue = state.queues[state.num_done]
+                while len(scan_queue) == 0:
+                    if state.closed:
+                        return False
+                    state.cond.wait()
+                item, size = scan_queue.popleft()
+                state.buffered_bytes -= size
+                if item is None:
+                    state.num_done += 1
+                state.cond.notify_all()
+            if isinstance(item, Exception):
+                self.close()
+                raise item
+            if item is not None:
+                self._buffer.extend(item)
+        return True
+
+    def _next_row(self):
+        if self._closed or self._rows_left == 0 or not self._fill_buffer():
+            self.close()
+            return None
+        if self._rows_left is not None:
+            self._rows_left -= 1
+        return self._buffer.popleft()
+
+    def next(self):
+        """Get next row.
+
+        Returns:
+           hbase.client.Row: Row object.
+           None: If all rows have been iterated.
+
+        Raises:
+            RegionError
+            RequestError
+
+            TransportError
+            ZookeeperProtocolError
+            ServiceProtocolError
+            NoSuchZookeeperNodeError
+
+        """
+        return self._next_row()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        """Get next row.
+
+        Returns:
+           client.Row: Row object.
+
+        Raises:
+            StopIteration: If all rows have been iterated.
+
+            RegionError
+            RequestError
+
+            TransportError
+            ZookeeperProtocolError
+            ServiceProtocolError
+            NoSuchZookeeperNodeError
+
+        """
+        row = self._next_row()
+        if row is None:
+            raise StopIteration()
+        return row
+
+
+class _ParallelScanState(object):
+
+    def __init__(self, client_, scanners, ordered, max_batches, max_bytes, parallelism):
+        """State shared by a ParallelCursor and its threads.
+
+        Args:
+            client_ (client.Client): Client object.
+            scanners (list[client.Scanner]): Scanners in key order.
+            ordered (bool): Each scanner has its own queue. Otherwise, all the scanners share one queue.
+            max_batches (int): Max number of batches buffered for each running scanner.
+            max_bytes (int|None): Max number of bytes buffered. None means no limit.
+            parallelism (int): Max number of scanners iterated at the same time.
+
+        """
+        self.client = client_
+        self.scanners = scanners
+        self.ordered = ordered
+        self.max_bytes = max_bytes
+
+        if ordered:
+            self.queues = [deque() for _ in scanners]
+            self.queue_size = max_batches
+        else:
+            # all the scanners share one queue, so index it in the same way as the ordered case
+            shared_queue = deque()
+            self.queues = [shared_queue] * len(scanners)
+            self.queue_size = max_batches * parallelism
+        self.buffered_bytes = 0
+        self.num_done = 0
+
+        self.cond = threading.Condition()
+        self.next_index = 0
+        self.closed = False
+
+    def run(self):
+        while True:
+            with self.cond:
+                if self.closed or self.next_index >= len(self.scanners):
+                    return
+                index = self.next_index
+                self.next_index += 1
+            scanner = self.scanners[index]
+            try:
+                while True:
+                    batch = self.client.iter_scanner(scanner)
+                    if batch is None:
+                        break
+                    if batch and not self._put(index, batch, _batch_bytes(batch)):
+                        return
+            except Exception as e:
+                # the error is raised by the consumer thread
+                self._put(index, e, 0)
+                return
+            # None marks the end of a scanner
+            if not self._put(index, None, 0):
+                return
+
+    def _put(self, index, item, size):
+        scan_queue = self.queues[index]
+        with self.cond:
+            while not self.closed and (len(scan_queue) >= self.queue_size or self._is_full(index)):
+                self.cond.wait()
+            if self.closed:
+                return False
+            scan_queue.append((item, size))
+            self.buffered_bytes += size
+            self.cond.notify_all()
+            return True
+
+    def _is_full(self, index):
+        if self.max_bytes is None or self.buffered_bytes == 0:
+            return False
+        if self.ordered and index == self.num_done and len(self.queues[index]) == 0:
+            # the consumer is waiting for this scanner, it must not be blocked by the others
+            return False
+        return self.buffered_bytes >= self.max_bytes
+
+
+_long = struct.Struct('>q')
+
+
+def _batch_bytes(batch):
+    return sum(
+        row.nbytes if isinstance(row, client.LazyRow) else
+        len(row.key) + sum(len(column) + len(value) for column, value in row.items())
+        for row in batch
+    )
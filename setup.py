@@ -34,5 +34,8 @@ if __name__ == '__main__':
             'requests',
             'protobuf',
             'kazoo'
-        ]
+        ],
+        extras_require={
+            'numpy': ['numpy']
+        }
     )